@@ -0,0 +1,283 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from flask import g, jsonify, request
+from latency import latency_percentiles
+
+# EWMA weight of the newest service time when estimating queue waits
+SERVICE_TIME_ALPHA = 0.2
+
+
+class RouteClass:
+    """Admission settings shared by a group of routes.
+
+    priority: lower runs first when requests are queued for a slot
+    max_concurrent: requests of this class running at once
+    max_queue: requests of this class waiting at once; more are shed
+    budget_seconds: end-to-end latency budget (queue wait + service)
+    service_seconds: initial service time estimate, refined as requests finish
+    reserved: slots only this class may use, so other classes cannot starve it
+    """
+
+    def __init__(self, name, priority, max_concurrent, max_queue, budget_seconds, service_seconds, reserved=0):
+        self.name = name
+        self.priority = priority
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.budget_seconds = budget_seconds
+        self.service_seconds = service_seconds
+        self.reserved = reserved
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = {'queue_full': 0, 'over_budget': 0, 'deadline': 0}
+        self.queue_waits = deque(maxlen=1000)
+
+    def record_service(self, seconds):
+        self.service_seconds += SERVICE_TIME_ALPHA * (seconds - self.service_seconds)
+
+    def to_dict(self):
+        return {
+            'priority': self.priority,
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'reserved': self.reserved,
+            'budget_ms': self.budget_seconds * 1000,
+            'service_time_ms': self.service_seconds * 1000,
+            'running': self.running,
+            'queued': self.queued,
+            'admitted': self.admitted,
+            'shed': dict(self.shed),
+            'queue_wait_ms': latency_percentiles(self.queue_waits)
+        }
+
+
+class Waiter:
+    def __init__(self, route_class, deadline, sequence):
+        self.route_class = route_class
+        self.deadline = deadline
+        self.sequence = sequence
+        self.granted = False
+        self.started = None
+        self.event = threading.Event()
+
+    @property
+    def order(self):
+        return (self.route_class.priority, self.deadline, self.sequence)
+
+
+class Rejected(Exception):
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Per-route concurrency limits with a priority queue and deadline-aware shedding.
+
+    At most max_concurrent requests run at once across all classes, and each
+    class has its own cap. Slots reserved by a class (predict) are never given
+    to the others, so slow routes (training, full-CSV reads, bcrypt logins)
+    can never hold every slot. Waiting requests get free slots in priority
+    order, earliest deadline first. A request is answered with a fast 503 and
+    Retry-After when its class queue is full, when the estimated queue
+    wait plus service time already exceeds its budget, or when it is still
+    queued at the last moment it could start and finish within budget.
+    """
+
+    def __init__(self, route_classes, routes, default_class, max_concurrent=8, exempt=()):
+        self.classes = {route_class.name: route_class for route_class in route_classes}
+        if sum(route_class.reserved for route_class in route_classes) >= max_concurrent:
+            raise ValueError('Reserved slots must leave at least one slot for the other route classes')
+        self.routes = routes
+        self.default_class = default_class
+        self.max_concurrent = max_concurrent
+        self.exempt = set(exempt)
+        self.running = 0
+        self.in_flight = []  # (started, route_class) of running requests
+        self.waiters = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return os.environ.get('ADMISSION_CONTROL', '1') != '0'
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    def route_class(self, rule):
+        if rule in self.exempt:
+            return None
+        return self.classes[self.routes.get(rule, self.default_class)]
+
+    def _has_slot(self, route_class):
+        if self.running >= self.max_concurrent or route_class.running >= route_class.max_concurrent:
+            return False
+        # Reserved slots another class is not using stay free for it
+        held_back = sum(
+            max(other.reserved - other.running, 0)
+            for other in self.classes.values() if other is not route_class
+        )
+        return self.running + held_back < self.max_concurrent
+
+    def _start(self, route_class):
+        started = time.monotonic()
+        self.running += 1
+        self.in_flight.append((started, route_class))
+        route_class.running += 1
+        route_class.admitted += 1
+        return started
+
+    def _next_release(self, route_class):
+        """Seconds until a running request that frees a slot for this class should finish"""
+        if route_class.running >= route_class.max_concurrent:
+            blocking = [(s, c) for s, c in self.in_flight if c is route_class]
+        else:
+            blocking = self.in_flight
+        if not blocking:
+            return 0.0
+        now = time.monotonic()
+        return max(min(started + c.service_seconds - now for started, c in blocking), 0.0)
+
+    def _estimated_wait(self, route_class):
+        """Time until the soonest running request finishes, plus the service
+        time of everything queued ahead spread over the class's slots"""
+        ahead = [w for w in self.waiters if w.route_class.priority <= route_class.priority]
+        backlog = sum(w.route_class.service_seconds for w in ahead)
+        return self._next_release(route_class) + backlog / min(route_class.max_concurrent, self.max_concurrent)
+
+    def _dispatch(self):
+        """Hand free slots to queued requests, highest priority / earliest deadline first"""
+        now = time.monotonic()
+        for waiter in sorted(self.waiters, key=lambda w: w.order):
+            if self.running >= self.max_concurrent:
+                break
+            if waiter.deadline < now or not self._has_slot(waiter.route_class):
+                continue
+            self.waiters.remove(waiter)
+            waiter.route_class.queued -= 1
+            waiter.granted = True
+            waiter.started = self._start(waiter.route_class)
+            waiter.event.set()
+
+    def acquire(self, route_class):
+        """Block until the request may run; raises Rejected if it should be shed"""
+        arrived = time.monotonic()
+        with self._lock:
+            # Slots are handed to waiters as soon as they free up, so a free
+            # slot here means nobody queued can use it
+            if self._has_slot(route_class):
+                started = self._start(route_class)
+                route_class.queue_waits.append(0.0)
+                return started
+
+            estimated_wait = self._estimated_wait(route_class)
+            if route_class.queued >= route_class.max_queue:
+                route_class.shed['queue_full'] += 1
+                raise Rejected('queue_full', estimated_wait)
+            if estimated_wait + route_class.service_seconds > route_class.budget_seconds:
+                route_class.shed['over_budget'] += 1
+                raise Rejected('over_budget', estimated_wait)
+
+            # Latest start that can still finish within the budget
+            deadline = arrived + route_class.budget_seconds - route_class.service_seconds
+            self._sequence += 1
+            waiter = Waiter(route_class, deadline, self._sequence)
+            self.waiters.append(waiter)
+            route_class.queued += 1
+
+        waiter.event.wait(max(deadline - time.monotonic(), 0))
+        with self._lock:
+            if not waiter.granted:
+                self.waiters.remove(waiter)
+                route_class.queued -= 1
+                route_class.shed['deadline'] += 1
+                raise Rejected('deadline', self._estimated_wait(route_class))
+            route_class.queue_waits.append(waiter.started - arrived)
+            return waiter.started
+
+    def release(self, route_class, started):
+        with self._lock:
+            self.running -= 1
+            self.in_flight.remove((started, route_class))
+            route_class.running -= 1
+            route_class.record_service(time.monotonic() - started)
+            self._dispatch()
+
+    def _before_request(self):
+        if not self.enabled or request.url_rule is None:
+            return None
+        route_class = self.route_class(request.url_rule.rule)
+        if route_class is None:
+            return None
+        try:
+            started = self.acquire(route_class)
+        except Rejected as e:
+            response = jsonify({
+                'error': 'Server is overloaded, please retry later',
+                'reason': e.reason,
+                'route_class': route_class.name
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+            return response
+        g.admission = (route_class, started)
+        return None
+
+    def _teardown_request(self, exc):
+        admission = g.pop('admission', None)
+        if admission is not None:
+            self.release(*admission)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'max_concurrent': self.max_concurrent,
+                'running': self.running,
+                'queued': len(self.waiters),
+                'classes': {name: route_class.to_dict() for name, route_class in self.classes.items()}
+            }
+
+
+def api_controller():
+    """Admission control for the fraud API routes
+
+    /api/predict is latency-critical for authorizations, so it gets priority
+    for request slots and two reserved ones, and the slow routes are capped
+    and shed.
+    """
+    max_concurrent = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 8))
+    return AdmissionController(
+        route_classes=[
+            RouteClass('predict', priority=0, max_concurrent=8, max_queue=64,
+                       budget_seconds=float(os.environ.get('PREDICT_BUDGET_MS', 500)) / 1000,
+                       service_seconds=0.02, reserved=min(2, max_concurrent - 1)),
+            RouteClass('default', priority=1, max_concurrent=4, max_queue=32,
+                       budget_seconds=2.0, service_seconds=0.05),
+            RouteClass('auth', priority=2, max_concurrent=2, max_queue=16,
+                       budget_seconds=2.0, service_seconds=0.3),
+            RouteClass('dataset', priority=3, max_concurrent=2, max_queue=8,
+                       budget_seconds=3.0, service_seconds=0.2),
+            RouteClass('batch', priority=4, max_concurrent=1, max_queue=2,
+                       budget_seconds=600.0, service_seconds=30.0)
+        ],
+        routes={
+            '/api/predict': 'predict',
+            '/api/login': 'auth',
+            '/api/register': 'auth',
+            '/api/train-from-csv': 'batch',
+            '/api/retrain-incremental': 'batch',
+            '/api/cross-validate': 'batch',
+            '/api/dataset-info': 'dataset',
+            '/api/sample-predictions': 'dataset'
+        },
+        default_class='default',
+        max_concurrent=max_concurrent,
+        exempt=['/api/health', '/api/admission-stats']
+    )
@@ -0,0 +1,180 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import joblib
+
+TARGET_COLUMN = 'Fraud Flag or Label'
+DATETIME_COLUMN = 'Transaction Date and Time'
+
+# Dimension name -> source column (hour_of_day is derived from the timestamp)
+DIMENSIONS = {
+    'mcc': 'Merchant Category Code (MCC)',
+    'card_type': 'Card Type',
+    'transaction_source': 'Transaction Source',
+    'currency': 'Transaction Currency',
+    'hour_of_day': DATETIME_COLUMN,
+    'city': 'Transaction Location (City or ZIP Code)'
+}
+
+
+class AggregateCube:
+    """Count / fraud-count aggregate for a single group-by dimension.
+
+    Keys are mapped to rows of a small int64 array so the cube stays compact
+    and an incremental update is a single vectorized add.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.counts = np.zeros((0, 2), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, keys, totals, frauds):
+        new_keys = [key for key in keys if key not in self.index]
+        if new_keys:
+            start = len(self.index)
+            for offset, key in enumerate(new_keys):
+                self.index[key] = start + offset
+            self.counts = np.vstack([self.counts, np.zeros((len(new_keys), 2), dtype=np.int64)])
+
+        rows = np.fromiter((self.index[key] for key in keys), dtype=np.int64, count=len(keys))
+        np.add.at(self.counts, (rows, 0), totals)
+        np.add.at(self.counts, (rows, 1), frauds)
+
+    def to_rows(self):
+        """Rows sorted by transaction count, most frequent first"""
+        keys = list(self.index.keys())
+        totals = self.counts[:, 0]
+        frauds = self.counts[:, 1]
+        order = np.argsort(-totals, kind='stable')
+        rows = []
+        for i in order:
+            total = int(totals[i])
+            rows.append({
+                'value': keys[i],
+                'count': total,
+                'fraud_count': int(frauds[i]),
+                'fraud_rate': float(frauds[i] / total) if total else 0.0
+            })
+        return rows
+
+
+class AnalyticsCubes:
+    """Group-by fraud aggregates computed once at ingest time.
+
+    Cubes are updated incrementally as labeled transactions arrive and the
+    JSON-ready breakdowns are cached until the next update, so serving a
+    breakdown never touches the CSV.
+    """
+
+    def __init__(self):
+        self.cubes = {name: AggregateCube() for name in DIMENSIONS}
+        self.total_count = 0
+        self.fraud_count = 0
+        self.source_fingerprint = None
+        self.label_log_offset = 0  # end of the label log already folded in
+        self._lock = threading.Lock()
+        self._payload_cache = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_payload_cache'] = {}
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('label_log_offset', 0)
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _dimension_values(self, data, name):
+        column = DIMENSIONS[name]
+        if column not in data.columns:
+            return None
+        if name == 'hour_of_day':
+            return pd.to_datetime(data[column], errors='coerce').dt.hour
+        return data[column]
+
+    def build(self, df, source_fingerprint=None):
+        """Rebuild every cube from a full labeled dataset"""
+        with self._lock:
+            self.cubes = {name: AggregateCube() for name in DIMENSIONS}
+            self.total_count = 0
+            self.fraud_count = 0
+            self._ingest(df)
+            self.source_fingerprint = source_fingerprint
+            self._payload_cache = {}
+
+    def update(self, df):
+        """Fold newly labeled transactions into the existing cubes"""
+        with self._lock:
+            added = self._ingest(df)
+            self._payload_cache = {}
+        return added
+
+    def _ingest(self, df):
+        if TARGET_COLUMN not in df.columns:
+            raise ValueError(f"Labeled transactions must include '{TARGET_COLUMN}'")
+
+        labels = pd.to_numeric(df[TARGET_COLUMN], errors='coerce')
+        df = df[labels.notna()]
+        labels = labels[labels.notna()].astype(np.int64)
+        if len(df) == 0:
+            return 0
+
+        for name, cube in self.cubes.items():
+            values = self._dimension_values(df, name)
+            if values is None:
+                continue
+            grouped = labels.groupby(values, dropna=True).agg(['count', 'sum'])
+            keys = [key.item() if isinstance(key, np.generic) else key for key in grouped.index]
+            if name == 'hour_of_day':
+                keys = [int(key) for key in keys]
+            cube.add(keys, grouped['count'].to_numpy(), grouped['sum'].to_numpy())
+
+        self.total_count += int(len(labels))
+        self.fraud_count += int(labels.sum())
+        return int(len(labels))
+
+    def summary(self):
+        return {
+            'total_transactions': self.total_count,
+            'fraud_count': self.fraud_count,
+            'fraud_rate': float(self.fraud_count / self.total_count) if self.total_count else 0.0,
+            'dimensions': {name: len(cube) for name, cube in self.cubes.items()}
+        }
+
+    def breakdown(self, dimension, limit=None):
+        """Get the cached fraud-rate breakdown for one dimension"""
+        if dimension not in self.cubes:
+            raise KeyError(f"Unknown dimension '{dimension}'. Available: {list(DIMENSIONS)}")
+
+        rows = self._payload_cache.get(dimension)
+        if rows is None:
+            with self._lock:
+                rows = self.cubes[dimension].to_rows()
+                self._payload_cache[dimension] = rows
+
+        return {
+            'dimension': dimension,
+            'column': DIMENSIONS[dimension],
+            'groups': len(rows),
+            'rows': rows[:limit] if limit else rows
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+def file_fingerprint(path):
+    """Identify a CSV version by size and modification time"""
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
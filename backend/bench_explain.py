@@ -0,0 +1,58 @@
+import json
+import time
+import pandas as pd
+from model_trainer import FraudDetectionModel, build_candidates
+from explainer import FraudExplainer
+
+# Benchmark of batched explanations for each candidate model type:
+# explainer build time (cached per model version) and the cost of explaining
+# a batch of flagged transactions.
+#
+#   python bench_explain.py [--batch 1000] [--repeats 5]
+
+def train_candidates(df):
+    trainer = FraudDetectionModel()
+    data = trainer.preprocess_data(df)
+    y = data['Fraud Flag or Label'].to_numpy()
+    trainer.scaler.fit(data[trainer.feature_columns])
+    X = trainer._feature_matrix(df, data, trainer.scaler, trainer.hash_features)
+
+    candidates = build_candidates()
+    for model in candidates.values():
+        model.fit(trainer._model_inputs(model, X), y)
+    meta = {'categories': trainer.categories, 'feature_columns': trainer.feature_columns}
+    return candidates, trainer.scaler, meta
+
+def run(batch_size, repeats):
+    df = pd.read_csv('credit_card_fraud.csv')
+    candidates, scaler, meta = train_candidates(df)
+    batch = df.drop(columns=['Fraud Flag or Label']).sample(batch_size, replace=True, random_state=0)
+
+    report = {}
+    for name, model in candidates.items():
+        start = time.perf_counter()
+        explainer = FraudExplainer(model, scaler, meta)
+        build_seconds = time.perf_counter() - start
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            explainer.explain(batch, top_k=5)
+            timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        report[name] = {
+            'method': explainer.method,
+            'batch_size': batch_size,
+            'build_ms': build_seconds * 1000,
+            'explain_ms_median': timings[len(timings) // 2] * 1000,
+            'explain_ms_max': timings[-1] * 1000,
+            'per_transaction_us': timings[len(timings) // 2] / batch_size * 1e6
+        }
+    return report
+
+if __name__ == '__main__':
+    import sys
+    batch_size = int(sys.argv[sys.argv.index('--batch') + 1]) if '--batch' in sys.argv else 1000
+    repeats = int(sys.argv[sys.argv.index('--repeats') + 1]) if '--repeats' in sys.argv else 5
+    print(json.dumps(run(batch_size, repeats), indent=2))
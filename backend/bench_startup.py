@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+# Cold-start benchmark: import time and peak RSS of a fresh worker process
+# for the serving entry point versus the training stack.
+#
+#   python bench_startup.py [--runs 5]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = ['xgboost', 'imblearn', 'sklearn.ensemble', 'sklearn.metrics', 'pymongo', 'flask_jwt_extended']
+print(json.dumps({{
+    'import_seconds': elapsed,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'loaded_modules': len(sys.modules),
+    'heavy_modules': [name for name in heavy if name in sys.modules]
+}}))
+"""
+
+TARGETS = {
+    # Prediction-only worker (imports Flask and loads the saved model bundle)
+    'serve': 'import serve',
+    # Training stack that app.py used to import up front
+    'model_trainer': 'import model_trainer',
+    # Full API (also connects to MongoDB, so it needs a reachable database)
+    'app': 'import app'
+}
+
+def measure(statement, timeout=60):
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(statement=statement)],
+        capture_output=True, text=True, timeout=timeout
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run(runs):
+    report = {}
+    for name, statement in TARGETS.items():
+        try:
+            samples = [measure(statement) for _ in range(runs)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            report[name] = {'error': str(e)}
+            continue
+        times = sorted(sample['import_seconds'] for sample in samples)
+        report[name] = {
+            'runs': runs,
+            'import_seconds_median': times[len(times) // 2],
+            'import_seconds_min': times[0],
+            'max_rss_mb': max(sample['max_rss_mb'] for sample in samples),
+            'loaded_modules': samples[-1]['loaded_modules'],
+            'heavy_modules': samples[-1]['heavy_modules']
+        }
+    return report
+
+if __name__ == '__main__':
+    runs = int(sys.argv[sys.argv.index('--runs') + 1]) if '--runs' in sys.argv else 5
+    print(json.dumps(run(runs), indent=2))
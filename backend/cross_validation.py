@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import joblib
+from scipy import sparse
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import precision_score, recall_score, f1_score
+from imblearn.over_sampling import SMOTE
+from model_trainer import FraudDetectionModel, build_candidates, fit_candidate, model_inputs
+from preprocessing import feature_matrix
+
+METRICS = {
+    'precision': precision_score,
+    'recall': recall_score,
+    'f1_score': f1_score
+}
+
+# Folds run next to the live API, so leave half the cores for serving
+MAX_N_JOBS = int(os.environ.get('CV_MAX_JOBS', max(1, (os.cpu_count() or 2) // 2)))
+
+# Candidates that run their own thread pool
+THREADED_CANDIDATES = ('RandomForest', 'XGBoost')
+
+
+def worker_count(n_jobs=None):
+    """Parallel fold workers to use: the request, capped at MAX_N_JOBS (-1 or None = the cap)"""
+    if n_jobs is None or n_jobs < 1:
+        return MAX_N_JOBS
+    return min(n_jobs, MAX_N_JOBS)
+
+
+def _dump_shared(X, y, directory):
+    """Write the feature matrix and labels as raw arrays that workers memory-map"""
+    X = sparse.csr_matrix(X)
+    paths = {}
+    for name, array in (('data', X.data), ('indices', X.indices), ('indptr', X.indptr), ('y', y)):
+        paths[name] = os.path.join(directory, f'{name}.npy')
+        np.save(paths[name], np.ascontiguousarray(array))
+    paths['shape'] = X.shape
+    return paths
+
+
+def _load_shared(paths):
+    """Re-open the shared arrays read-only; the pages are shared, not copied"""
+    arrays = {name: np.load(paths[name], mmap_mode='r') for name in ('data', 'indices', 'indptr', 'y')}
+    X = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']), shape=paths['shape'], copy=False)
+    return X, arrays['y']
+
+
+def _evaluate_fold(paths, candidate_name, fold, train_index, test_index, n_dense, threads=1):
+    """Fit one candidate on one fold and score it (runs in a worker process)"""
+    start = time.perf_counter()
+    X, y = _load_shared(paths)
+    X_train, y_train = X[train_index], np.asarray(y[train_index])
+    X_test, y_test = X[test_index], np.asarray(y[test_index])
+
+    # Balance the training fold only, so the test fold keeps the real fraud rate
+    X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+
+    # Tree ensembles get their share of the capped cores, not every core (XGBoost's default)
+    model = build_candidates()[candidate_name]
+    if candidate_name in THREADED_CANDIDATES:
+        model.set_params(n_jobs=threads)
+    model = fit_candidate(model, X_train, y_train, n_dense)
+    y_pred = model.predict(model_inputs(model, X_test, n_dense))
+
+    scores = {name: float(metric(y_test, y_pred, zero_division=0)) for name, metric in METRICS.items()}
+    scores['n_features'] = int(model.n_features_in_)
+    scores['fit_seconds'] = time.perf_counter() - start
+    return candidate_name, fold, scores
+
+
+def cross_validate(df, n_splits=5, n_jobs=None, candidates=None):
+    """Stratified k-fold evaluation of every candidate model, folds in parallel
+
+    The feature matrix is built and scaled once and written to memory-mapped
+    files, so each worker process reads the same pages instead of receiving
+    its own pickled copy of the data. Workers times threads per worker stays
+    within MAX_N_JOBS cores.
+    """
+    trainer = FraudDetectionModel()
+    trainer.fit_categories(df)
+    data = trainer.preprocess_data(df)
+    n_dense = len(trainer.feature_columns)
+    y = data['Fraud Flag or Label'].to_numpy().astype(np.int64)
+
+    trainer.scaler.fit(data[trainer.feature_columns])
+    X = feature_matrix(df, trainer.scaler, trainer.feature_columns, n_hash=trainer.hash_features, data=data)
+
+    candidates = candidates or list(build_candidates())
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42).split(np.zeros(len(y)), y))
+
+    workers = worker_count(n_jobs)
+    threads = max(1, MAX_N_JOBS // workers)
+
+    shared_dir = tempfile.mkdtemp(prefix='cv_')
+    start = time.perf_counter()
+    try:
+        paths = _dump_shared(X, y, shared_dir)
+        # loky would otherwise give each worker cpu_count // workers OpenMP/BLAS threads
+        with joblib.parallel_config(backend='loky', inner_max_num_threads=threads):
+            results = joblib.Parallel(n_jobs=workers)(
+                joblib.delayed(_evaluate_fold)(paths, name, fold, train_index, test_index, n_dense, threads)
+                for name in candidates
+                for fold, (train_index, test_index) in enumerate(folds)
+            )
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    report = {}
+    for name in candidates:
+        fold_scores = [scores for candidate, _, scores in sorted(results, key=lambda r: r[1]) if candidate == name]
+        report[name] = {
+            metric: {
+                'mean': float(np.mean([s[metric] for s in fold_scores])),
+                'variance': float(np.var([s[metric] for s in fold_scores])),
+                'std': float(np.std([s[metric] for s in fold_scores])),
+                'folds': [s[metric] for s in fold_scores]
+            }
+            for metric in METRICS
+        }
+        report[name]['mean_fit_seconds'] = float(np.mean([s['fit_seconds'] for s in fold_scores]))
+        report[name]['n_features'] = fold_scores[0]['n_features']
+
+    return {
+        'n_splits': n_splits,
+        'n_jobs': workers,
+        'threads_per_worker': threads,
+        'total_samples': len(y),
+        'fraud_samples': int(y.sum()),
+        'elapsed_seconds': time.perf_counter() - start,
+        'candidates': report
+    }
@@ -0,0 +1,159 @@
+import numpy as np
+from scipy import sparse
+from preprocessing import (
+    bundle_feature_matrix, hash_column, hashed_values, hashed_width, FEATURE_COLUMNS, HASHED_COLUMNS
+)
+
+# Hashed columns a row has no value in can still carry attribution (e.g. XGBoost
+# treats absent sparse entries as missing); it is reported under this name
+OTHER_HASHED_REASON = 'Other hashed features'
+
+
+class FraudExplainer:
+    """Per-transaction feature attributions for one model bundle.
+
+    - XGBoost: exact TreeSHAP contributions from the booster (log-odds)
+    - RandomForest: path attributions (change in fraud probability at every
+      split on the decision path), computed for the whole batch with one
+      sparse product against a per-forest matrix built once
+    - Linear models: coefficient times scaled feature value (log-odds)
+
+    Hashed columns are attributed back to the high-cardinality field that
+    hashed into them, so reasons always name a transaction field.
+    """
+
+    def __init__(self, model, scaler, meta=None):
+        self.model = model
+        self.scaler = scaler
+        self.meta = meta or {}
+        self.feature_columns = self.meta.get('feature_columns') or FEATURE_COLUMNS
+        self.n_hash = hashed_width(model, len(self.feature_columns))
+        self.reason_names = list(self.feature_columns)
+        if self.n_hash:
+            self.reason_names += list(HASHED_COLUMNS) + [OTHER_HASHED_REASON]
+        self._path_matrix = None
+        self._path_bias = None
+
+        if hasattr(model, 'get_booster'):
+            self.method, self.units = 'tree_shap', 'log_odds'
+        elif hasattr(model, 'estimators_') and hasattr(model, 'decision_path'):
+            self.method, self.units = 'tree_path', 'probability'
+            self._build_path_matrix()
+        elif hasattr(model, 'coef_'):
+            self.method, self.units = 'linear', 'log_odds'
+        else:
+            raise ValueError(f'Explanations are not supported for {type(model).__name__}')
+
+    def _build_path_matrix(self):
+        """Precompute node -> feature contribution deltas for every tree in the forest
+
+        Each non-root node carries (p(node) - p(parent)) on the feature its
+        parent split on. Multiplying the forest's decision-path indicator by
+        this matrix sums the deltas along every sample's paths.
+        """
+        blocks = []
+        biases = []
+        n_features = self.model.n_features_in_
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            values = tree.value[:, 0, :]
+            fraud_prob = values[:, -1] / values.sum(axis=1)
+
+            parents = np.full(tree.node_count, -1)
+            for children in (tree.children_left, tree.children_right):
+                is_child = children >= 0
+                parents[children[is_child]] = np.nonzero(is_child)[0]
+
+            nodes = np.nonzero(parents >= 0)[0]
+            deltas = fraud_prob[nodes] - fraud_prob[parents[nodes]]
+            blocks.append(sparse.csr_matrix(
+                (deltas, (nodes, tree.feature[parents[nodes]])),
+                shape=(tree.node_count, n_features)
+            ))
+            biases.append(fraud_prob[0])
+
+        n_trees = len(self.model.estimators_)
+        self._path_matrix = sparse.vstack(blocks, format='csr') / n_trees
+        self._path_bias = float(np.mean(biases))
+
+    def feature_matrix(self, transactions_df):
+        """The same matrix the scorer predicts on"""
+        return bundle_feature_matrix(transactions_df, self.model, self.scaler, self.meta)
+
+    def contributions(self, X):
+        """Raw per-column attributions (n_rows, n_columns) and the base value"""
+        if self.method == 'tree_shap':
+            import xgboost as xgb
+
+            contribs = self.model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True)
+            return contribs[:, :-1], float(contribs[0, -1]) if len(contribs) else 0.0
+
+        if self.method == 'tree_path':
+            indicator, _ = self.model.decision_path(X)
+            return (indicator @ self._path_matrix).toarray(), self._path_bias
+
+        coef = np.ravel(self.model.coef_)
+        if sparse.issparse(X):
+            contribs = X.multiply(coef).toarray()
+        else:
+            contribs = np.asarray(X) * coef
+        return contribs, float(np.ravel(self.model.intercept_)[0])
+
+    def field_contributions(self, transactions_df, contribs):
+        """Fold hashed-column attributions back onto their source fields"""
+        n_rows, n_dense = len(transactions_df), len(self.feature_columns)
+        fields = np.zeros((n_rows, len(self.reason_names)))
+        fields[:, :n_dense] = contribs[:, :n_dense]
+        if not self.n_hash:
+            return fields
+
+        hashed = contribs[:, n_dense:]
+        rows = np.arange(n_rows)
+        buckets = {
+            col: hash_column(hashed_values(transactions_df, col), column_index, self.n_hash)[0]
+            for column_index, col in enumerate(HASHED_COLUMNS)
+        }
+
+        for col, col_buckets in buckets.items():
+            # Fields that collide in one row share that bucket's attribution
+            sharing = sum((other == col_buckets).astype(int) for other in buckets.values())
+            fields[:, self.reason_names.index(col)] = hashed[rows, col_buckets] / sharing
+
+        assigned = fields[:, n_dense:-1].sum(axis=1)
+        fields[:, -1] = hashed.sum(axis=1) - assigned
+        return fields
+
+    def explain(self, transactions_df, top_k=5):
+        """Top reasons per transaction, strongest first"""
+        transactions_df = transactions_df.reset_index(drop=True)
+        contribs, base_value = self.contributions(self.feature_matrix(transactions_df))
+        fields = self.field_contributions(transactions_df, contribs)
+
+        top = np.argsort(-np.abs(fields), axis=1)[:, :top_k]
+        top_contributions = np.take_along_axis(fields, top, axis=1).tolist()
+
+        # Raw transaction values as JSON-safe Python objects, one list per field
+        values = {}
+        for name in self.reason_names:
+            if name in transactions_df.columns:
+                column = transactions_df[name].astype(object)
+                values[name] = column.where(column.notna(), None).tolist()
+
+        explanations = []
+        for i, (indices, contributions) in enumerate(zip(top.tolist(), top_contributions)):
+            reasons = []
+            for j, contribution in zip(indices, contributions):
+                name = self.reason_names[j]
+                reasons.append({
+                    'feature': name,
+                    'value': values[name][i] if name in values else None,
+                    'contribution': contribution
+                })
+            explanations.append({'reasons': reasons})
+
+        return {
+            'method': self.method,
+            'units': self.units,
+            'base_value': base_value,
+            'explanations': explanations
+        }
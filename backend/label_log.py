@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+
+
+class LabelLog:
+    """Append-only log of labeled transactions posted to the API.
+
+    Each batch is appended as JSON lines, so a post costs the size of the
+    batch rather than the whole backlog. A byte offset stored next to the log
+    marks how far training has consumed it: retraining reads a snapshot up to
+    the current end, and afterwards advances the offset to that end only, so
+    rows posted while the model trains stay pending for the next update.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset_path = path + '.offset'
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def _consumed_offset(self):
+        if not os.path.exists(self.offset_path):
+            return 0
+        with open(self.offset_path) as f:
+            return int(f.read().strip() or 0)
+
+    def _read(self, start):
+        if not os.path.exists(self.path):
+            return [], 0
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read()
+        return [json.loads(line) for line in data.splitlines() if line.strip()], start + len(data)
+
+    def append(self, records):
+        """Append labeled transaction dicts; returns (end offset, pending row count)"""
+        lines = ''.join(json.dumps(record, default=str) + '\n' for record in records).encode()
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(lines)
+                end = f.tell()
+            if self._pending is None:
+                self._pending = len(self._read(self._consumed_offset())[0])
+            else:
+                self._pending += len(records)
+            return end, self._pending
+
+    def read(self, start=None):
+        """(records, end offset) from start; by default the rows not consumed yet"""
+        with self._lock:
+            return self._read(self._consumed_offset() if start is None else start)
+
+    def consume(self, end):
+        """Mark everything up to the end offset of a snapshot as used for training"""
+        with self._lock:
+            if end <= self._consumed_offset():
+                return
+            tmp_path = self.offset_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(str(end))
+            os.replace(tmp_path, self.offset_path)
+            self._pending = None
+
+    def pending_count(self):
+        with self._lock:
+            if self._pending is None:
+                self._pending = len(self._read(self._consumed_offset())[0])
+            return self._pending
@@ -0,0 +1,10 @@
+# Shared by the serving stats (shadow scoring, admission control) and the load tests
+
+def latency_percentiles(latencies):
+    """p50/p95/p99 in milliseconds of a collection of latencies in seconds"""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None}
+    def percentile(q):
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+    return {'p50': percentile(0.50), 'p95': percentile(0.95), 'p99': percentile(0.99)}
@@ -0,0 +1,139 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from latency import latency_percentiles
+
+# Overload test for admission control: drives /api/predict while other
+# clients flood /api/dataset-info, /api/sample-predictions and /api/login,
+# with ADMISSION_CONTROL off and on, and compares predict latency and the
+# share of fast 503s the slow routes get. Needs a trained model.
+#
+#   python loadtest_admission.py [--requests 300] [--concurrency 4] [--flooders 16]
+#   python loadtest_admission.py --url http://localhost:5000   # a server that is already running
+
+def arg(name, default):
+    return type(default)(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+def call(url, payload=None):
+    """(status, Retry-After, latency) of one request; HTTP errors are results, not exceptions"""
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            status, retry_after = response.status, None
+    except urllib.error.HTTPError as e:
+        e.read()
+        status, retry_after = e.code, e.headers.get('Retry-After')
+    except OSError:
+        status, retry_after = 'connection_error', None
+    return status, retry_after, time.perf_counter() - start
+
+def summarize(results):
+    statuses = {}
+    for status, _, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    shed = [r for r in results if r[0] == 503]
+    return {
+        'requests': len(results),
+        'status_codes': statuses,
+        'shed_with_retry_after': sum(1 for r in shed if r[1] is not None),
+        'latency_ms': latency_percentiles([r[2] for r in results if r[0] == 200]),
+        'shed_latency_ms': latency_percentiles([r[2] for r in shed])
+    }
+
+def flood(base_url, stop, results):
+    targets = [
+        (f'{base_url}/api/dataset-info', None),
+        (f'{base_url}/api/sample-predictions', None),
+        (f'{base_url}/api/login', {'email': 'loadtest@example.com', 'password': 'not-a-password'})
+    ]
+    i = 0
+    while not stop.is_set():
+        url, payload = targets[i % len(targets)]
+        results.append((url.rsplit('/', 1)[-1], call(url, payload)))
+        i += 1
+
+def run_overload(base_url, batches, concurrency, flooders):
+    predict_url = f'{base_url}/api/predict'
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        baseline = list(pool.map(lambda batch: call(predict_url, {'transactions': batch}), batches))
+
+    stop = threading.Event()
+    background = []
+    threads = [threading.Thread(target=flood, args=(base_url, stop, background)) for _ in range(flooders)]
+    for thread in threads:
+        thread.start()
+    time.sleep(2)  # let the flood build up
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        overload = list(pool.map(lambda batch: call(predict_url, {'transactions': batch}), batches))
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    routes = sorted(set(route for route, _ in background))
+    return {
+        'predict_baseline': summarize(baseline),
+        'predict_under_overload': summarize(overload),
+        'background': {route: summarize([r for name, r in background if name == route]) for route in routes}
+    }
+
+def run_server(admission_enabled, port, batches, concurrency, flooders):
+    env = dict(os.environ, PORT=str(port), ADMISSION_CONTROL='1' if admission_enabled else '0',
+               PREDICTION_CACHE_SIZE='0', SHADOW_SCORING='0')
+    # app.py runs with the debug reloader, so stop the whole process group
+    server = subprocess.Popen(
+        [sys.executable, 'app.py'], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.time() + 120
+        while call(f'{base_url}/api/health')[0] != 200:
+            if time.time() > deadline or server.poll() is not None:
+                raise RuntimeError('app.py did not start')
+            time.sleep(0.5)
+        result = run_overload(base_url, batches, concurrency, flooders)
+        if admission_enabled:
+            with urllib.request.urlopen(f'{base_url}/api/admission-stats', timeout=5) as response:
+                result['admission'] = json.loads(response.read())
+        return result
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+if __name__ == '__main__':
+    n_requests = arg('--requests', 300)
+    concurrency = arg('--concurrency', 4)
+    flooders = arg('--flooders', 16)
+    batch_size = arg('--batch', 10)
+    port = arg('--port', 5065)
+    url = arg('--url', '')
+
+    df = pd.read_csv('credit_card_fraud.csv').drop(columns=['Fraud Flag or Label'])
+    records = df.where(df.notna(), None).to_dict('records')
+    batches = [
+        [records[(i * batch_size + j) % len(records)] for j in range(batch_size)]
+        for i in range(n_requests)
+    ]
+
+    if url:
+        report = run_overload(url, batches, concurrency, flooders)
+    else:
+        report = {
+            'admission_off': run_server(False, port, batches, concurrency, flooders),
+            'admission_on': run_server(True, port, batches, concurrency, flooders)
+        }
+        off = report['admission_off']['predict_under_overload']['latency_ms']
+        on = report['admission_on']['predict_under_overload']['latency_ms']
+        report['predict_p99_change_ms'] = on['p99'] - off['p99']
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from latency import latency_percentiles
+
+# Load test for shadow scoring: runs serve.py with SHADOW_SCORING off and on
+# against the same traffic and compares champion latency percentiles.
+# Needs a trained model and challengers (POST /api/train-from-csv on app.py).
+#
+#   python loadtest_shadow.py [--requests 500] [--concurrency 8] [--batch 20]
+
+def arg(name, default):
+    return type(default)(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+def post_json(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start: {url}')
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+def run_load(base_url, batches, concurrency):
+    def send(batch):
+        start = time.perf_counter()
+        post_json(f'{base_url}/api/predict', {'transactions': batch})
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(send, batches))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / elapsed,
+        'latency_ms': latency_percentiles(latencies)
+    }
+
+def run_server(shadow_enabled, port, batches, concurrency):
+    env = dict(os.environ, PORT=str(port), SHADOW_SCORING='1' if shadow_enabled else '0',
+               PREDICTION_CACHE_SIZE='0')
+    server = subprocess.Popen(
+        [sys.executable, 'serve.py'], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_up(f'{base_url}/api/health')
+        run_load(base_url, batches[:50], concurrency)  # warm-up, also starts the shadow worker
+        deadline = time.time() + 120
+        while shadow_enabled and not get_json(f'{base_url}/api/shadow-stats')['worker_ready']:
+            if time.time() > deadline:
+                raise RuntimeError('Shadow worker did not load the challengers')
+            time.sleep(0.5)
+        result = run_load(base_url, batches, concurrency)
+        time.sleep(1)
+        result['shadow'] = get_json(f'{base_url}/api/shadow-stats')
+        return result
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == '__main__':
+    n_requests = arg('--requests', 500)
+    concurrency = arg('--concurrency', 8)
+    batch_size = arg('--batch', 20)
+    port = arg('--port', 5055)
+
+    df = pd.read_csv('credit_card_fraud.csv').drop(columns=['Fraud Flag or Label'])
+    records = df.where(df.notna(), None).to_dict('records')
+    batches = [
+        [records[(i * batch_size + j) % len(records)] for j in range(batch_size)]
+        for i in range(n_requests)
+    ]
+
+    report = {
+        'shadow_off': run_server(False, port, batches, concurrency),
+        'shadow_on': run_server(True, port, batches, concurrency)
+    }
+    off, on = report['shadow_off']['latency_ms'], report['shadow_on']['latency_ms']
+    report['champion_p99_change_ms'] = on['p99'] - off['p99']
+    print(json.dumps(report, indent=2))
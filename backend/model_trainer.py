@@ -3,52 +3,86 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sklearn.utils.class_weight import compute_class_weight
 import xgboost as xgb
 from imblearn.over_sampling import SMOTE
+from preprocessing import (
+    preprocess_transactions, hash_transactions, combine_features, feature_matrix, hashed_width,
+    CATEGORICAL_COLUMNS, TARGET_COLUMN, DEFAULT_HASH_FEATURES
+)
+import copy
 import warnings
 warnings.filterwarnings('ignore')
 
+# Models that train efficiently on the sparse hashed block; the others
+# (RandomForest) only see the dense features
+SPARSE_INPUT_MODELS = (xgb.XGBClassifier, LogisticRegression, SGDClassifier)
+
+def build_candidates():
+    """Fresh, unfitted instances of the candidate models"""
+    return {
+        'RandomForest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'XGBoost': xgb.XGBClassifier(random_state=42),
+        'LogisticRegression': LogisticRegression(random_state=42, max_iter=1000)
+    }
+
+def model_inputs(model, X, n_dense):
+    """Drop the hashed columns for models that do not take sparse input"""
+    if isinstance(model, SPARSE_INPUT_MODELS) or X.shape[1] == n_dense:
+        return X
+    return X[:, :n_dense].toarray()
+
+def fit_candidate(model, X, y, n_dense):
+    """Fit one candidate on (already balanced) training data"""
+    # Calculate class weights for imbalanced data
+    class_weights = compute_class_weight('balanced', classes=np.unique(y), y=y)
+    weight_dict = dict(zip(np.unique(y), class_weights))
+
+    if hasattr(model, 'class_weight'):
+        model.class_weight = weight_dict
+
+    model.fit(model_inputs(model, X, n_dense), y)
+    return model
+
 class FraudDetectionModel:
     def __init__(self):
         self.scaler = StandardScaler()
         self.model = None
         self.feature_columns = None
+        self.hash_features = DEFAULT_HASH_FEATURES
+        self.categories = {}
+        self.holdout = None
+        self.holdout_max_rows = 2000
+        self.candidates = {}
 
     def preprocess_data(self, df):
-        data = df.copy()
-        # Select relevant columns
-        feature_cols = [
-            'Transaction Amount',
-            'Merchant Category Code (MCC)',
-            'Transaction Response Code',
-            'Card Type',
-            'Transaction Source'
-        ]
-        # Only keep the columns we need + target
-        if 'Fraud Flag or Label' in data.columns:
-            feature_cols_with_target = feature_cols + ['Fraud Flag or Label']
-            data = data[feature_cols_with_target]
-        else:
-            data = data[feature_cols]
-
-        # Fill missing values
-        data = data.fillna(0)
-
-        # Encode categorical columns
-        for col in ['Card Type', 'Transaction Source']:
-            if col in data.columns:
-                data[col] = pd.Categorical(data[col]).codes
+        data = preprocess_transactions(df, self.categories)
 
         # Set feature columns for later use
-        self.feature_columns = [col for col in data.columns if col != 'Fraud Flag or Label']
+        self.feature_columns = [col for col in data.columns if col != TARGET_COLUMN]
 
         return data
 
+    def _feature_matrix(self, df, data, scaler, n_hash):
+        """Scaled dense features plus the hashed high-cardinality columns"""
+        return feature_matrix(df, scaler, self.feature_columns, n_hash=n_hash, data=data)
+
+    def _model_inputs(self, model, X):
+        return model_inputs(model, X, len(self.feature_columns))
+
+    def fit_categories(self, df):
+        """Fix the categorical encoding for this model version"""
+        self.categories = {
+            col: sorted(df[col].dropna().unique().tolist())
+            for col in CATEGORICAL_COLUMNS if col in df.columns
+        }
+
     def train_model(self, df):
         """Train the fraud detection model"""
+        self.fit_categories(df)
+
         # Preprocess data
         data = self.preprocess_data(df)
 
@@ -56,14 +90,17 @@ class FraudDetectionModel:
         X = data[self.feature_columns]
         y = data['Fraud Flag or Label']
 
+        # Hash high-cardinality fields into a fixed-width sparse block
+        X_hashed = hash_transactions(df, self.hash_features)
+
         # Split the data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
+        X_train, X_test, X_hashed_train, X_hashed_test, y_train, y_test = train_test_split(
+            X, X_hashed, y, test_size=0.2, random_state=42, stratify=y
         )
 
-        # Scale the features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        # Scale the dense features and append the hashed ones
+        X_train_scaled = combine_features(self.scaler.fit_transform(X_train), X_hashed_train)
+        X_test_scaled = combine_features(self.scaler.transform(X_test), X_hashed_test)
 
         # Handle class imbalance using SMOTE
         smote = SMOTE(random_state=42)
@@ -76,33 +113,22 @@ class FraudDetectionModel:
             X_train_balanced, y_train_balanced = smote_result[0], smote_result[1]
 
         # Train multiple models and select the best one
-        models = {
-            'RandomForest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'XGBoost': xgb.XGBClassifier(random_state=42),
-            'LogisticRegression': LogisticRegression(random_state=42, max_iter=1000)
-        }
+        models = build_candidates()
 
         best_score = 0
         best_model = None
+        candidate_scores = {}
 
         for name, model in models.items():
-            # Calculate class weights for imbalanced data
-            class_weights = compute_class_weight(
-                'balanced', classes=np.unique(y_train_balanced), y=y_train_balanced
-            )
-            weight_dict = dict(zip(np.unique(y_train_balanced), class_weights))
-
-            if hasattr(model, 'class_weight'):
-                model.class_weight = weight_dict
-
             # Train the model
-            model.fit(X_train_balanced, y_train_balanced)
+            fit_candidate(model, X_train_balanced, y_train_balanced, len(self.feature_columns))
 
             # Predict on test set
-            y_pred = model.predict(X_test_scaled)
+            y_pred = model.predict(self._model_inputs(model, X_test_scaled))
 
             # Calculate F1 score (good for imbalanced data)
             f1 = f1_score(y_test, y_pred)
+            candidate_scores[name] = float(f1)
 
             if f1 > best_score:
                 best_score = f1
@@ -112,9 +138,14 @@ class FraudDetectionModel:
             best_model = list(models.values())[0]
 
         self.model = best_model
+        # Keep the other candidates so they can be served as challengers
+        self.candidates = models
+
+        # Seed the rolling hold-out used to validate incremental updates
+        self.holdout = df.loc[X_test.index].tail(self.holdout_max_rows)
 
         # Calculate final metrics
-        y_pred_final = best_model.predict(X_test_scaled)
+        y_pred_final = best_model.predict(self._model_inputs(best_model, X_test_scaled))
 
         metrics = {
             'accuracy': float(accuracy_score(y_test, y_pred_final)),
@@ -123,21 +154,112 @@ class FraudDetectionModel:
             'f1_score': float(f1_score(y_test, y_pred_final)),
             'fraud_rate': float(np.mean(y_test)),
             'total_samples': len(y_test),
-            'fraud_samples': int(np.sum(y_test))
+            'fraud_samples': int(np.sum(y_test)),
+            'candidate_f1_scores': candidate_scores
         }
 
         return best_model, self.scaler, metrics
 
+    def update_model(self, new_df, model, scaler, holdout_fraction=0.2, tolerance=0.005):
+        """Incrementally update a trained model with newly labeled transactions
+
+        Only the new rows are used: XGBoost keeps boosting from the existing
+        booster, RandomForest grows extra trees and the linear model continues
+        from its current coefficients with SGD. The candidate is promoted only
+        if it does at least as well as the current model on the rolling hold-out.
+        """
+        if 'Fraud Flag or Label' not in new_df.columns:
+            raise ValueError('New transactions must include Fraud Flag or Label')
+
+        # Route part of the new rows to the rolling hold-out
+        new_df = new_df.sample(frac=1, random_state=42)
+        n_holdout = int(len(new_df) * holdout_fraction)
+        holdout_rows, train_rows = new_df.iloc[:n_holdout], new_df.iloc[n_holdout:]
+        holdout = pd.concat([self.holdout, holdout_rows]) if self.holdout is not None else holdout_rows
+        holdout = holdout.tail(self.holdout_max_rows)
+
+        data = self.preprocess_data(train_rows)
+        X_new = data[self.feature_columns]
+        y_new = np.array(data['Fraud Flag or Label'])
+        n_hash = hashed_width(model, len(self.feature_columns))
+        if len(np.unique(y_new)) < 2:
+            raise ValueError('New transactions must contain both fraud and non-fraud labels')
+
+        # Tree split thresholds are tied to the scaling they were grown on,
+        # so only the linear model moves to the updated scaler statistics
+        candidate_scaler = copy.deepcopy(scaler)
+        is_linear = hasattr(model, 'coef_')
+        if is_linear:
+            candidate_scaler.partial_fit(X_new)
+        X_new_scaled = self._feature_matrix(train_rows, data, candidate_scaler, n_hash)
+
+        # Balance the new rows when there are enough minority samples for SMOTE
+        minority = int(np.min(np.bincount(y_new.astype(int))))
+        if minority > 5:
+            X_new_scaled, y_new = SMOTE(random_state=42).fit_resample(X_new_scaled, y_new)
+
+        candidate = self._continue_training(model, X_new_scaled, y_new)
+
+        # Validate both models on the rolling hold-out before promoting
+        holdout_data = self.preprocess_data(holdout)
+        y_holdout = holdout_data['Fraud Flag or Label']
+        current_f1 = f1_score(y_holdout, model.predict(self._feature_matrix(holdout, holdout_data, scaler, n_hash)))
+        y_pred = candidate.predict(self._feature_matrix(holdout, holdout_data, candidate_scaler, n_hash))
+        candidate_f1 = f1_score(y_holdout, y_pred)
+        promoted = candidate_f1 >= current_f1 - tolerance
+
+        self.holdout = holdout
+        if promoted:
+            self.model = candidate
+            self.scaler = candidate_scaler
+
+        metrics = {
+            'promoted': bool(promoted),
+            'model_type': type(candidate).__name__,
+            'new_samples': len(new_df),
+            'train_samples': len(train_rows),
+            'holdout_samples': len(holdout),
+            'current_f1_score': float(current_f1),
+            'candidate_f1_score': float(candidate_f1),
+            'precision': float(precision_score(y_holdout, y_pred)),
+            'recall': float(recall_score(y_holdout, y_pred))
+        }
+
+        return candidate, candidate_scaler, metrics
+
+    def _continue_training(self, model, X, y):
+        """Fit a copy of the model on new data, starting from its current state"""
+        if isinstance(model, xgb.XGBClassifier):
+            candidate = xgb.XGBClassifier(**model.get_params())
+            candidate.set_params(n_estimators=max(10, model.get_params().get('n_estimators') or 100) // 10)
+            candidate.fit(X, y, xgb_model=model.get_booster())
+        elif isinstance(model, RandomForestClassifier):
+            candidate = copy.deepcopy(model)
+            candidate.set_params(warm_start=True, n_estimators=model.n_estimators + max(10, model.n_estimators // 10))
+            candidate.fit(X, y)
+        elif isinstance(model, SGDClassifier):
+            candidate = copy.deepcopy(model)
+            candidate.partial_fit(X, y)
+        elif isinstance(model, LogisticRegression):
+            # Continue the logistic loss from the current coefficients with SGD
+            candidate = SGDClassifier(
+                loss='log_loss', alpha=1.0 / (model.C * len(y)), learning_rate='constant',
+                eta0=0.01, max_iter=5, tol=None, random_state=42
+            )
+            candidate.fit(X, y, coef_init=model.coef_, intercept_init=model.intercept_)
+        else:
+            raise ValueError(f'Incremental updates are not supported for {type(model).__name__}')
+        return candidate
+
     def predict_fraud(self, transactions_df, model, scaler):
         """Predict fraud for new transactions"""
         # Preprocess the transactions
         data = self.preprocess_data(transactions_df)
 
-        # Select features
-        X = data[self.feature_columns]
-
-        # Scale features
-        X_scaled = scaler.transform(X)
+        # Scale features and append the hashed columns the model was trained with
+        X_scaled = self._feature_matrix(
+            transactions_df, data, scaler, hashed_width(model, len(self.feature_columns))
+        )
 
         # Make predictions
         predictions = model.predict(X_scaled)
@@ -153,9 +275,17 @@ class FraudDetectionModel:
         else:
             return None
 
+        # Hash buckets mix several fields, so report them as one combined feature
+        n_dense = len(self.feature_columns)
+        features = list(self.feature_columns)
+        importances = list(importance[:n_dense])
+        if len(importance) > n_dense:
+            features.append('Hashed high-cardinality fields')
+            importances.append(float(np.sum(importance[n_dense:])))
+
         feature_importance = pd.DataFrame({
-            'feature': self.feature_columns,
-            'importance': importance
+            'feature': features,
+            'importance': importances
         }).sort_values('importance', ascending=False)
 
         return feature_importance 
\ No newline at end of file
@@ -0,0 +1,105 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Approximate per-entry overhead of the OrderedDict slot, key tuple and value
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class PredictionCache:
+    """Bounded LRU + TTL cache of predictions keyed by transaction ID.
+
+    Entries belong to one model version; when a lookup arrives for a different
+    version the whole cache is dropped, so a new model never serves stale results.
+    """
+
+    def __init__(self, max_entries=100000, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry_size(self, transaction_id):
+        return sys.getsizeof(transaction_id) + ENTRY_OVERHEAD_BYTES
+
+    def _check_version(self, model_version):
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._memory_bytes = 0
+            self.model_version = model_version
+
+    def get_many(self, transaction_ids, model_version):
+        """Look up predictions; returns {index: prediction} for the cache hits"""
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(model_version)
+            for i, transaction_id in enumerate(transaction_ids):
+                if transaction_id is None:
+                    continue
+                entry = self._entries.get(transaction_id)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                prediction, expires_at = entry
+                if expires_at < now:
+                    del self._entries[transaction_id]
+                    self._memory_bytes -= self._entry_size(transaction_id)
+                    self.expirations += 1
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(transaction_id)
+                found[i] = prediction
+                self.hits += 1
+        return found
+
+    def put_many(self, transaction_ids, predictions, model_version):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._check_version(model_version)
+            for transaction_id, prediction in zip(transaction_ids, predictions):
+                if transaction_id is None:
+                    continue
+                if transaction_id not in self._entries:
+                    self._memory_bytes += self._entry_size(transaction_id)
+                self._entries[transaction_id] = (prediction, expires_at)
+                self._entries.move_to_end(transaction_id)
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._memory_bytes -= self._entry_size(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'model_version': self.model_version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'memory_bytes': self._memory_bytes
+        }
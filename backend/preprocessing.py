@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# Kept free of training dependencies so the serving path can import it cheaply
+
+TARGET_COLUMN = 'Fraud Flag or Label'
+
+FEATURE_COLUMNS = [
+    'Transaction Amount',
+    'Merchant Category Code (MCC)',
+    'Transaction Response Code',
+    'Card Type',
+    'Transaction Source'
+]
+
+CATEGORICAL_COLUMNS = ['Card Type', 'Transaction Source']
+
+# High-cardinality fields that are hashed into a fixed-width sparse space
+HASHED_COLUMNS = [
+    'Merchant Name',
+    'Transaction Location (City or ZIP Code)',
+    'IP Address',
+    'Device Information'
+]
+
+DEFAULT_HASH_FEATURES = 2 ** 12
+
+def preprocess_transactions(df, categories=None):
+    """Select and encode the model features of a transactions DataFrame"""
+    categories = categories or {}
+    data = df.copy()
+
+    # Only keep the columns we need + target
+    if TARGET_COLUMN in data.columns:
+        data = data[FEATURE_COLUMNS + [TARGET_COLUMN]]
+    else:
+        data = data[FEATURE_COLUMNS]
+
+    # Fill missing values
+    data = data.fillna(0)
+
+    # Encode categorical columns (with the training categories once known,
+    # so codes do not depend on which values appear in a batch)
+    for col in CATEGORICAL_COLUMNS:
+        if col in data.columns:
+            if col in categories:
+                data[col] = pd.Categorical(data[col], categories=categories[col]).codes
+            else:
+                data[col] = pd.Categorical(data[col]).codes
+
+    return data
+
+def labeled_record_error(record):
+    """Why a posted labeled transaction cannot be used for training, or None"""
+    if not isinstance(record, dict):
+        return 'must be an object'
+    label = record.get(TARGET_COLUMN)
+    if isinstance(label, bool) or label not in (0, 1):
+        return f'{TARGET_COLUMN} must be 0 or 1'
+    missing = [col for col in FEATURE_COLUMNS if record.get(col) is None]
+    if missing:
+        return f'missing {missing}'
+    return None
+
+def labeled_records(records):
+    """Split posted labeled transactions into (valid records, {index: error})
+
+    Valid records get an int label, so the log, the cubes and training all
+    see the same rows.
+    """
+    valid, errors = [], {}
+    for index, record in enumerate(records):
+        error = labeled_record_error(record)
+        if error:
+            errors[index] = error
+        else:
+            valid.append({**record, TARGET_COLUMN: int(record[TARGET_COLUMN])})
+    return valid, errors
+
+def hash_text(values):
+    """Text a column is hashed on, the same whether it came from a CSV or JSON
+
+    Missing values hash like empty strings, and whole-number floats (a ZIP code
+    column read from a CSV with gaps) hash like the integers JSON would send.
+    Works column-wise so hashing stays vectorized over the batch.
+    """
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.to_numpy(dtype=float, na_value=np.nan)
+        whole = np.isfinite(numbers) & (numbers == np.floor(numbers)) & (np.abs(numbers) < 2.0 ** 63)
+        other = ~whole & ~np.isnan(numbers)
+        text = np.full(len(numbers), '', dtype=object)
+        text[whole] = numbers[whole].astype(np.int64).astype(str)
+        text[other] = values[other].astype(str).to_numpy(dtype=object)
+        return text
+
+    text = values.astype(str).to_numpy(dtype=object)
+    text[values.isna().to_numpy()] = ''
+    return text
+
+def hashed_values(df, col):
+    """A hashed field's values; a field missing from the whole batch counts as empty"""
+    return df[col] if col in df.columns else pd.Series([''] * len(df), index=df.index)
+
+def hash_column(values, column_index, n_features):
+    """Hash one column to (bucket, sign) arrays; each column gets its own hash key"""
+    hashes = pd.util.hash_array(hash_text(values), hash_key=f'{column_index:016d}')
+    buckets = (hashes % np.uint64(n_features)).astype(np.int64)
+    signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+    return buckets, signs
+
+def hash_transactions(df, n_features=DEFAULT_HASH_FEATURES):
+    """Map the high-cardinality fields of a batch into an (n_rows, n_features) CSR matrix
+
+    Hashing is stateless, so training and serving produce identical columns
+    and memory stays bounded no matter how many merchants or IPs appear.
+    """
+    from scipy import sparse
+
+    n_rows = len(df)
+    if n_rows == 0:
+        return sparse.csr_matrix((0, n_features))
+
+    rows, cols, vals = [], [], []
+    for column_index, col in enumerate(HASHED_COLUMNS):
+        buckets, signs = hash_column(hashed_values(df, col), column_index, n_features)
+        rows.append(np.arange(n_rows))
+        cols.append(buckets)
+        vals.append(signs)
+
+    # Duplicate (row, bucket) pairs are summed when converting to CSR
+    return sparse.coo_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_rows, n_features)
+    ).tocsr()
+
+def combine_features(X_scaled, X_hashed):
+    """Append hashed columns to the scaled dense features as one CSR matrix"""
+    from scipy import sparse
+
+    if X_hashed is None or X_hashed.shape[1] == 0:
+        return X_scaled
+    return sparse.hstack([sparse.csr_matrix(X_scaled), X_hashed], format='csr')
+
+def feature_matrix(transactions_df, scaler, feature_columns, categories=None, n_hash=0, data=None):
+    """Scaled dense features plus n_hash hashed columns
+
+    The one pipeline used by training, serving and explanations; pass data if
+    the transactions were already preprocessed.
+    """
+    if data is None:
+        data = preprocess_transactions(transactions_df, categories)
+    X_scaled = scaler.transform(data[feature_columns])
+    return combine_features(X_scaled, hash_transactions(transactions_df, n_hash) if n_hash else None)
+
+def bundle_feature_matrix(transactions_df, model, scaler, meta):
+    """Feature matrix for a saved (model, scaler, meta) bundle"""
+    feature_columns = meta.get('feature_columns') or FEATURE_COLUMNS
+    n_hash = hashed_width(model, len(feature_columns))
+    return feature_matrix(transactions_df, scaler, feature_columns, meta.get('categories'), n_hash)
+
+def hashed_width(model, n_dense):
+    """Number of hashed columns a fitted model expects (0 for older models)"""
+    return max(int(getattr(model, 'n_features_in_', n_dense)) - n_dense, 0)
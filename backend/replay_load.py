@@ -0,0 +1,277 @@
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+from latency import latency_percentiles
+
+# Replays credit_card_fraud.csv (optionally expanded with synthetic copies)
+# against /api/predict in 'Transaction Date and Time' order and reports
+# throughput, latency percentiles, error and fraud-flag rates as JSON.
+#
+#   python replay_load.py --start-server serve --rate 200 --batch-size 10 --concurrency 8
+#   python replay_load.py --url http://localhost:5000 --speedup 1e6 --expand 5 --output run.json
+
+TIME_COLUMN = 'Transaction Date and Time'
+LABEL_COLUMN = 'Fraud Flag or Label'
+
+
+def load_transactions(csv_path):
+    df = pd.read_csv(csv_path)
+    df['_timestamp'] = pd.to_datetime(df[TIME_COLUMN], errors='coerce')
+    return df.dropna(subset=['_timestamp']).sort_values('_timestamp', kind='stable').reset_index(drop=True)
+
+
+def expand_transactions(df, copies, seed=42):
+    """Yield DataFrames of the original rows followed by jittered synthetic copies
+
+    Copy k is shifted k dataset-spans later, its amounts are jittered by up to
+    +/-10% and it gets fresh Transaction IDs (so the prediction cache does not answer them).
+    """
+    rng = np.random.default_rng(seed)
+    span = df['_timestamp'].max() - df['_timestamp'].min() + pd.Timedelta(seconds=1)
+    yield df
+    for k in range(1, copies):
+        copy = df.copy()
+        copy['_timestamp'] = copy['_timestamp'] + span * k
+        copy[TIME_COLUMN] = copy['_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        if 'Transaction Amount' in copy.columns:
+            jitter = rng.uniform(0.9, 1.1, len(copy))
+            copy['Transaction Amount'] = (copy['Transaction Amount'] * jitter).round(2)
+        if 'Transaction ID' in copy.columns:
+            copy['Transaction ID'] = [str(uuid.uuid4()) for _ in range(len(copy))]
+        yield copy
+
+
+def iter_batches(frames, batch_size, limit=None):
+    """Stream (first_timestamp, records, labels) batches in time order"""
+    sent = 0
+    for frame in frames:
+        labels = frame[LABEL_COLUMN].tolist() if LABEL_COLUMN in frame.columns else None
+        timestamps = frame['_timestamp'].tolist()
+        payload = frame.drop(columns=['_timestamp', LABEL_COLUMN], errors='ignore')
+        records = payload.astype(object).where(payload.notna(), None).to_dict('records')
+        for start in range(0, len(records), batch_size):
+            if limit is not None and sent >= limit:
+                return
+            end = min(start + batch_size, len(records))
+            if limit is not None:
+                end = min(end, start + limit - sent)
+            sent += end - start
+            yield timestamps[start], records[start:end], labels[start:end] if labels else None
+
+
+def summarize_latencies(latencies):
+    summary = latency_percentiles(latencies)
+    if latencies:
+        summary['mean'] = 1000 * sum(latencies) / len(latencies)
+        summary['max'] = 1000 * max(latencies)
+    return summary
+
+
+class ReplayClient:
+    """Thread-safe /api/predict client with one keep-alive connection per thread"""
+
+    def __init__(self, base_url, timeout=30):
+        url = urlparse(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = url.path.rstrip('/') + '/api/predict'
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.status_counts = {}
+        self.errors = 0
+        self.transactions = 0
+        self.scored = 0
+        self.flagged = 0
+        self.label_matches = 0
+        self.labeled = 0
+
+    def _connection(self):
+        if getattr(self._local, 'connection', None) is None:
+            self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return self._local.connection
+
+    def send(self, records, labels):
+        body = json.dumps({'transactions': records})
+        start = time.perf_counter()
+        try:
+            connection = self._connection()
+            connection.request('POST', self.path, body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self._local.connection = None
+            status, payload = 'connection_error', None
+        latency = time.perf_counter() - start
+
+        predictions = None
+        if status == 200:
+            predictions = json.loads(payload).get('predictions')
+
+        with self._lock:
+            self.latencies.append(latency)
+            self.status_counts[str(status)] = self.status_counts.get(str(status), 0) + 1
+            self.transactions += len(records)
+            if predictions is None:
+                self.errors += 1
+                return
+            self.scored += len(predictions)
+            self.flagged += sum(int(p) for p in predictions)
+            if labels:
+                self.labeled += len(labels)
+                self.label_matches += sum(int(p) == int(label) for p, label in zip(predictions, labels))
+
+
+def replay(base_url, batches, concurrency, rate=None, speedup=None):
+    """Send batches with bounded concurrency, paced by rate or by original timestamps"""
+    client = ReplayClient(base_url)
+    slots = threading.Semaphore(concurrency)
+    max_lag = 0.0
+    first_timestamp = None
+    sent = 0
+
+    def run(records, labels):
+        try:
+            client.send(records, labels)
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for timestamp, records, labels in batches:
+            # When to send this batch, relative to the start of the replay
+            if rate:
+                due = sent / rate
+            elif speedup:
+                first_timestamp = first_timestamp or timestamp
+                due = (timestamp - first_timestamp).total_seconds() / speedup
+            else:
+                due = 0.0
+
+            delay = due - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+            slots.acquire()
+            max_lag = max(max_lag, (time.perf_counter() - start) - due)
+            pool.submit(run, records, labels)
+            sent += len(records)
+    elapsed = time.perf_counter() - start
+
+    requests = len(client.latencies)
+    return {
+        'duration_seconds': elapsed,
+        'requests': requests,
+        'transactions': client.transactions,
+        'throughput': {
+            'requests_per_second': requests / elapsed if elapsed else 0.0,
+            'transactions_per_second': client.transactions / elapsed if elapsed else 0.0
+        },
+        'latency_ms': summarize_latencies(client.latencies),
+        'status_codes': client.status_counts,
+        'error_rate': client.errors / requests if requests else 0.0,
+        'fraud_flag_rate': client.flagged / client.scored if client.scored else 0.0,
+        'label_agreement': client.label_matches / client.labeled if client.labeled else None,
+        'max_schedule_lag_seconds': max_lag
+    }
+
+
+def start_server(entry_point, port):
+    """Start app.py or serve.py locally and wait for /api/health"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{entry_point}.py')
+    env = dict(os.environ, PORT=str(port))
+    # app.py runs with the debug reloader, so the server gets its own process group
+    server = subprocess.Popen(
+        [sys.executable, script], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'{entry_point}.py exited with code {server.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError(f'{entry_point}.py did not become healthy on port {port}')
+
+
+def stop_server(server):
+    os.killpg(server.pid, signal.SIGTERM)
+    server.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Replay transactions against /api/predict')
+    parser.add_argument('--csv', default='credit_card_fraud.csv')
+    parser.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:5000')
+    parser.add_argument('--start-server', choices=['serve', 'app'], help='Start this entry point locally')
+    parser.add_argument('--port', type=int, default=5060)
+    pacing = parser.add_mutually_exclusive_group()
+    pacing.add_argument('--rate', type=float, help='Target transactions per second')
+    pacing.add_argument('--speedup', type=float, help='Replay original inter-arrival times this many times faster')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--expand', type=int, default=1, help='Total dataset copies, synthetic ones jittered')
+    parser.add_argument('--limit', type=int, help='Stop after this many transactions')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+    if not args.url and not args.start_server:
+        parser.error('one of --url or --start-server is required')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    df = load_transactions(args.csv)
+    started_at = datetime.now().isoformat()
+
+    server = start_server(args.start_server, args.port) if args.start_server else None
+    base_url = args.url or f'http://127.0.0.1:{args.port}'
+    try:
+        batches = iter_batches(expand_transactions(df, args.expand), args.batch_size, args.limit)
+        result = replay(base_url, batches, args.concurrency, rate=args.rate, speedup=args.speedup)
+    finally:
+        if server is not None:
+            stop_server(server)
+
+    report = {
+        'started_at': started_at,
+        'config': {
+            'target': args.start_server or base_url,
+            'csv': args.csv,
+            'expand': args.expand,
+            'rate': args.rate,
+            'speedup': args.speedup,
+            'concurrency': args.concurrency,
+            'batch_size': args.batch_size,
+            'limit': args.limit
+        },
+        **result
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import os
+import time
+import traceback
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+from serving import FraudScorer
+from prediction_cache import PredictionCache
+from shadow import ShadowScorer
+
+# Prediction-only entry point: no training libraries, MongoDB or JWT setup.
+# Run with `python serve.py` or `gunicorn serve:app`.
+
+app = Flask(__name__)
+CORS(app)
+
+scorer = FraudScorer(cache=PredictionCache(
+    max_entries=int(os.environ.get('PREDICTION_CACHE_SIZE', 100000)),
+    ttl_seconds=float(os.environ.get('PREDICTION_CACHE_TTL', 600))
+))
+
+# Load the model while the worker starts so the first request is not slowed down
+if scorer.exists():
+    scorer.load()
+
+# Challenger bundles in models/challengers are shadow-scored on a separate pool
+shadow = ShadowScorer(scorer)
+shadow.load()
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Fraud prediction service is running',
+        'model_loaded': scorer.is_loaded()
+    })
+
+@app.route('/api/predict', methods=['POST'])
+def predict():
+    """Predict fraud for credit card transactions"""
+    try:
+        data = request.get_json()
+
+        if not data or 'transactions' not in data:
+            return jsonify({'error': 'No transactions data provided'}), 400
+
+        start = time.perf_counter()
+        if not scorer.ensure_loaded():
+            return jsonify({'error': 'Model not trained yet. Please train the model first.'}), 400
+
+        import numpy as np
+
+        predictions = scorer.predict_transactions(data['transactions'])
+
+        response = jsonify({
+            'predictions': predictions.tolist(),
+            'total_transactions': len(predictions),
+            'fraud_count': int(np.sum(predictions)),
+            'fraud_percentage': float(np.mean(predictions) * 100)
+        })
+
+        # Challengers score the same batch once the response has been sent
+        shadow.record_champion_latency(time.perf_counter() - start)
+        response.call_on_close(lambda: shadow.submit(data['transactions'], predictions))
+        return response
+
+    except Exception as e:
+        print("Prediction error:", str(e))
+        print("Full traceback:", traceback.format_exc())
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/model-info', methods=['GET'])
+def model_info():
+    """Get information about the model being served"""
+    if not scorer.ensure_loaded():
+        return jsonify({'model_exists': False, 'message': 'No trained model found'})
+    return jsonify({'model_exists': True, **scorer.info()})
+
+@app.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    """Get prediction cache hit rate and memory use"""
+    return jsonify(scorer.cache.stats())
+
+@app.route('/api/shadow-stats', methods=['GET'])
+def shadow_stats():
+    """Get live-traffic agreement, score distributions and latency per challenger"""
+    return jsonify(shadow.stats())
+
+@app.route('/api/reload-model', methods=['POST'])
+def reload_model():
+    """Reload the model bundle after a new version has been saved"""
+    try:
+        if not scorer.exists():
+            return jsonify({'error': 'No trained model found'}), 404
+        scorer.load()
+        shadow.load()
+        return jsonify({'message': 'Model reloaded', 'challengers': list(shadow.challengers), **scorer.info()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5001))
+    print("Starting fraud prediction service...")
+    print("- GET  /api/health")
+    print("- POST /api/predict")
+    print("- GET  /api/model-info")
+    print("- GET  /api/cache-stats")
+    print("- GET  /api/shadow-stats")
+    print("- POST /api/reload-model")
+    app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,175 @@
+import os
+import json
+import math
+import threading
+
+# Serving only needs the saved model bundle. Heavy modules are imported on
+# first use, and joblib pulls in just the estimator classes the pickle needs,
+# so training dependencies (SMOTE, unused estimators, metrics) never load.
+
+MODEL_PATH = 'models/fraud_detection_model.pkl'
+SCALER_PATH = 'models/scaler.pkl'
+META_PATH = 'models/model_meta.json'
+TRANSACTION_ID_COLUMN = 'Transaction ID'
+# JSON scalars usable as cache keys; lists or objects sent as an ID are not cached
+CACHEABLE_ID_TYPES = (str, int, float)
+
+
+def cacheable_id(transaction_id):
+    """The ID as a cache key, or None if it cannot safely be one
+
+    Booleans are excluded because True == 1 would share an entry with ID 1,
+    and NaN/inf because NaN never equals itself and would never hit.
+    """
+    if isinstance(transaction_id, bool) or not isinstance(transaction_id, CACHEABLE_ID_TYPES):
+        return None
+    if isinstance(transaction_id, float) and not math.isfinite(transaction_id):
+        return None
+    return transaction_id
+
+
+class FraudScorer:
+    """Scores transactions with the current model bundle (model, scaler, metadata)"""
+
+    def __init__(self, model_path=MODEL_PATH, scaler_path=SCALER_PATH, meta_path=META_PATH, cache=None):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.meta_path = meta_path
+        self.cache = cache
+        # (bundle_version, (model, scaler, meta)), swapped as one object
+        self._state = (0, None)
+        self._explainer = (None, None)
+        self._lock = threading.Lock()
+
+    @property
+    def bundle(self):
+        return self._state[1]
+
+    @property
+    def bundle_version(self):
+        """Process-local counter that changes every time a bundle is swapped in"""
+        return self._state[0]
+
+    def exists(self):
+        return os.path.exists(self.model_path) and os.path.exists(self.scaler_path)
+
+    def is_loaded(self):
+        return self.bundle is not None
+
+    def load(self):
+        """Load the saved bundle from disk, replacing the current one"""
+        import joblib
+        import preprocessing  # noqa: F401 - warm the feature pipeline before the first request
+
+        with self._lock:
+            model = joblib.load(self.model_path)
+            scaler = joblib.load(self.scaler_path)
+            meta = {}
+            if os.path.exists(self.meta_path):
+                with open(self.meta_path) as f:
+                    meta = json.load(f)
+            self.set_bundle(model, scaler, meta)
+        return self.bundle
+
+    def ensure_loaded(self):
+        """Load the bundle on first use; returns False if no model is saved"""
+        if self.bundle is None:
+            if not self.exists():
+                return False
+            self.load()
+        return True
+
+    def set_bundle(self, model, scaler, meta):
+        """Swap in a new bundle atomically (e.g. right after training)"""
+        self._state = (self._state[0] + 1, (model, scaler, meta or {}))
+
+    @property
+    def version(self):
+        if self.bundle is None:
+            return None
+        return self.bundle[2].get('version', 0)
+
+    def _feature_matrix(self, transactions_df, bundle):
+        from preprocessing import bundle_feature_matrix
+
+        return bundle_feature_matrix(transactions_df, *bundle)
+
+    def predict(self, transactions_df, bundle=None):
+        """Predict fraud labels for a DataFrame of transactions"""
+        bundle = bundle or self.bundle
+        return bundle[0].predict(self._feature_matrix(transactions_df, bundle))
+
+    def predict_proba(self, transactions_df, bundle=None):
+        """Predict fraud probabilities for a DataFrame of transactions"""
+        bundle = bundle or self.bundle
+        return bundle[0].predict_proba(self._feature_matrix(transactions_df, bundle))[:, 1]
+
+    def predict_transactions(self, transactions):
+        """Predict fraud labels for a list of transaction dicts
+
+        Retried transactions are answered from the cache by 'Transaction ID'
+        before any DataFrame is built; only the cache misses are scored.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if self.cache is None:
+            return self.predict(pd.DataFrame(transactions))
+
+        version, bundle = self._state
+        ids = [t.get(TRANSACTION_ID_COLUMN) if isinstance(t, dict) else None for t in transactions]
+        ids = [cacheable_id(i) for i in ids]
+        found = self.cache.get_many(ids, version)
+        if len(found) == len(transactions):
+            return np.array([found[i] for i in range(len(transactions))])
+
+        misses = [i for i in range(len(transactions)) if i not in found]
+        scored = self.predict(pd.DataFrame([transactions[i] for i in misses]), bundle)
+        self.cache.put_many([ids[i] for i in misses], scored.tolist(), version)
+        if not found:
+            return scored
+
+        predictions = np.empty(len(transactions), dtype=scored.dtype)
+        predictions[misses] = scored
+        for i, prediction in found.items():
+            predictions[i] = prediction
+        return predictions
+
+    def get_explainer(self):
+        """Explainer for the current bundle, built once per model version"""
+        version, bundle = self._state
+        cached_version, explainer = self._explainer
+        if cached_version != version:
+            from explainer import FraudExplainer
+
+            explainer = FraudExplainer(*bundle)
+            self._explainer = (version, explainer)
+        return explainer
+
+    def explain_transactions(self, transactions, top_k=5, only_flagged=True):
+        """Predict a batch and explain the flagged (or all) transactions"""
+        import numpy as np
+        import pandas as pd
+
+        explainer = self.get_explainer()
+        predictions = self.predict_transactions(transactions)
+        rows = np.nonzero(predictions)[0] if only_flagged else np.arange(len(transactions))
+        if len(rows) == 0:
+            return {'method': explainer.method, 'units': explainer.units, 'explanations': []}
+
+        result = explainer.explain(pd.DataFrame([transactions[i] for i in rows]), top_k=top_k)
+        for i, explanation in zip(rows, result['explanations']):
+            explanation['index'] = int(i)
+            explanation['prediction'] = int(predictions[i])
+            if isinstance(transactions[i], dict):
+                explanation['transaction_id'] = transactions[i].get(TRANSACTION_ID_COLUMN)
+        return result
+
+    def info(self):
+        model, _, meta = self.bundle
+        return {
+            'model_type': type(model).__name__,
+            'model_version': meta.get('version'),
+            'update_type': meta.get('update_type'),
+            'trained_at': meta.get('trained_at')
+        }
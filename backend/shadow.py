@@ -0,0 +1,249 @@
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+from collections import deque
+from latency import latency_percentiles
+
+CHALLENGERS_DIR = 'models/challengers'
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shadow_worker.py')
+BUNDLE_FILES = ('model.pkl', 'scaler.pkl', 'model_meta.json')
+SCORE_BINS = 10
+CHAMPION = '__champion__'  # the champion's entry in the worker's scored set
+
+
+class ModelShadowStats:
+    """Live-traffic statistics for one shadow-scored model"""
+
+    def __init__(self, max_latencies=1000):
+        self.transactions = 0
+        self.batches = 0
+        self.flagged = 0
+        self.agreements = 0
+        self.score_histogram = [0] * SCORE_BINS
+        self.latencies = deque(maxlen=max_latencies)
+
+    def record(self, scores, champion_predictions, latency):
+        flags = [score >= 0.5 for score in scores]
+        self.batches += 1
+        self.transactions += len(scores)
+        self.flagged += sum(flags)
+        self.agreements += sum(int(flag) == int(p) for flag, p in zip(flags, champion_predictions))
+        for score in scores:
+            self.score_histogram[min(int(score * SCORE_BINS), SCORE_BINS - 1)] += 1
+        self.latencies.append(latency)
+
+    def distribution(self):
+        return {
+            'transactions': self.transactions,
+            'flag_rate': self.flagged / self.transactions if self.transactions else 0.0,
+            'score_histogram': self.score_histogram
+        }
+
+    def to_dict(self):
+        return {
+            **self.distribution(),
+            'batches': self.batches,
+            'agreement_with_champion': self.agreements / self.transactions if self.transactions else None,
+            'latency_ms': latency_percentiles(self.latencies)
+        }
+
+
+class ShadowScorer:
+    """Scores every champion batch with the challenger bundles, off the request path.
+
+    Batches are queued once the champion's response has been sent and scored
+    by a separate, lower-priority worker process (shadow_worker.py), so
+    challengers never compete with the champion for the GIL. The queue is
+    bounded: when challengers fall behind, batches are dropped (and counted)
+    instead of piling up.
+
+    The worker process starts on the first submitted batch, in the process
+    that serves it: a worker started at import time would not survive a
+    forking server (gunicorn --preload) and would sit idle in the debug
+    reloader's parent process.
+
+    The worker scores the champion bundle in the same pass, so every
+    challenger's score histogram can be compared with the champion's on the
+    same traffic.
+    """
+
+    def __init__(self, champion, challengers_dir=CHALLENGERS_DIR, max_pending=4):
+        self.champion = champion
+        self.challengers_dir = challengers_dir
+        self.max_pending = max_pending
+        self.challengers = []
+        self.queue = None
+        self.worker = None
+        self.worker_pid = None  # process the worker and dispatch thread belong to
+        self.worker_champion_version = None
+        self.generation = 0
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats_by_model = {}
+        self.champion_stats = ModelShadowStats()
+        self.champion_latencies = deque(maxlen=1000)
+        self.submitted = 0
+        self.dropped = 0
+        self.errors = 0
+        self.worker_ready = False
+
+    @property
+    def enabled(self):
+        return bool(self.challengers) and os.environ.get('SHADOW_SCORING', '1') != '0'
+
+    def challenger_paths(self, name):
+        return [os.path.join(self.challengers_dir, name, filename) for filename in BUNDLE_FILES]
+
+    def champion_paths(self):
+        """The champion's saved bundle, or None if it has not been saved"""
+        if self.champion is None or not self.champion.exists():
+            return None
+        return [self.champion.model_path, self.champion.scaler_path, self.champion.meta_path]
+
+    def discover(self):
+        if not os.path.isdir(self.challengers_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.challengers_dir)
+            if all(os.path.exists(path) for path in self.challenger_paths(name))
+        )
+
+    def load(self):
+        """Pick up the challenger bundles on disk; the worker restarts on the next batch"""
+        self.stop()
+        challengers = self.discover()
+        with self._lock:
+            self.generation += 1
+            self.challengers = challengers
+            self.reset_stats()
+        return challengers
+
+    def _start_worker(self):
+        self.queue = queue.Queue(maxsize=self.max_pending)
+        self.worker = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        self.worker_pid = os.getpid()
+        bundles = [(name, self.challenger_paths(name)) for name in self.challengers]
+        champion_paths = self.champion_paths()
+        if champion_paths is not None:
+            bundles.append((CHAMPION, champion_paths))
+        self.worker_champion_version = self.champion.version if self.champion is not None else None
+        threading.Thread(
+            target=self._dispatch, args=(self.generation, self.worker, self.queue, bundles),
+            name='shadow-dispatch', daemon=True
+        ).start()
+
+    def stop(self):
+        with self._lock:
+            self._stop_worker()
+
+    def _stop_worker(self):
+        # After a fork the worker and its dispatch thread belong to the parent
+        if self.worker_pid == os.getpid():
+            if self.queue is not None:
+                try:
+                    self.queue.put_nowait(None)
+                except queue.Full:
+                    pass
+            if self.worker is not None:
+                self.worker.terminate()
+        self.queue = None
+        self.worker = None
+        self.worker_pid = None
+
+    def record_champion_latency(self, seconds):
+        self.champion_latencies.append(seconds)
+
+    def submit(self, transactions, champion_predictions):
+        """Queue a scored batch for the challengers; never blocks the caller"""
+        with self._lock:
+            if not self.enabled:
+                return False
+            if self.worker_pid == os.getpid() and self.champion is not None \
+                    and self.champion.version != self.worker_champion_version:
+                # The champion was replaced in place (incremental update): score the new one
+                self._stop_worker()
+                self.generation += 1
+                self.stats_by_model = {}
+                self.champion_stats = ModelShadowStats()
+                self.worker_ready = False
+            if self.worker_pid != os.getpid():
+                self._start_worker()
+            try:
+                self.queue.put_nowait((transactions, list(champion_predictions)))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.submitted += 1
+        return True
+
+    def _call(self, worker, kind, payload):
+        pickle.dump((kind, payload), worker.stdin)
+        worker.stdin.flush()
+        status, result = pickle.load(worker.stdout)
+        if status != 'ok':
+            raise RuntimeError(result)
+        return result
+
+    def _dispatch(self, generation, worker, batches, bundles):
+        """Feed queued batches to the worker process and record its results"""
+        try:
+            self._call(worker, 'load', bundles)
+        except (EOFError, OSError):
+            return  # stopped before it finished loading
+        except Exception as e:
+            print("Shadow worker failed to load challengers:", str(e))
+            return
+        with self._lock:
+            if generation == self.generation:
+                self.worker_ready = True
+
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            transactions, champion_predictions = item
+            try:
+                results = self._call(worker, 'score', transactions)
+            except (EOFError, OSError):
+                break
+            except Exception as e:
+                print("Shadow scoring error:", str(e))
+                with self._lock:
+                    self.errors += 1
+                continue
+
+            with self._lock:
+                if generation != self.generation:
+                    break
+                if CHAMPION in results:
+                    scores, latency = results.pop(CHAMPION)
+                    self.champion_stats.record(scores, champion_predictions, latency)
+                for name, (scores, latency) in results.items():
+                    if name not in self.stats_by_model:
+                        self.stats_by_model[name] = ModelShadowStats()
+                    self.stats_by_model[name].record(scores, champion_predictions, latency)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'worker_ready': self.worker_ready,
+                'challengers': list(self.challengers),
+                'submitted_batches': self.submitted,
+                'dropped_batches': self.dropped,
+                'pending_batches': self.queue.qsize() if self.queue is not None else 0,
+                'errors': self.errors,
+                'champion': {
+                    'model_version': self.champion.version if self.champion is not None else None,
+                    'latency_ms': latency_percentiles(self.champion_latencies),
+                    **self.champion_stats.distribution()
+                },
+                'models': {name: stats.to_dict() for name, stats in self.stats_by_model.items()}
+            }
@@ -0,0 +1,61 @@
+import os
+import pickle
+import sys
+import time
+
+# Challenger scoring process used by shadow.ShadowScorer. Reads pickled
+# ('load', [(name, paths)]) and ('score', transactions) messages on stdin and
+# writes one pickled (status, result) reply per message to stdout.
+
+def handle(kind, payload, scorers):
+    if kind == 'load':
+        from serving import FraudScorer
+
+        scorers.clear()
+        for name, paths in payload:
+            scorer = FraudScorer(*paths)
+            scorer.load()
+            scorers[name] = scorer
+        return list(scorers)
+
+    if kind == 'score':
+        import pandas as pd
+
+        transactions_df = pd.DataFrame(payload)
+        results = {}
+        for name, scorer in scorers.items():
+            start = time.perf_counter()
+            scores = scorer.predict_proba(transactions_df).tolist()
+            results[name] = (scores, time.perf_counter() - start)
+        return results
+
+    raise ValueError(f'Unknown message: {kind}')
+
+def main():
+    # Yield the CPU to the serving process when both are busy
+    if hasattr(os, 'nice'):
+        os.nice(19)
+
+    # Keep the protocol stream to ourselves; stray prints go to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    requests = sys.stdin.buffer
+
+    scorers = {}
+    while True:
+        try:
+            kind, payload = pickle.load(requests)
+        except EOFError:
+            break
+        try:
+            reply = ('ok', handle(kind, payload, scorers))
+        except Exception as e:
+            reply = ('error', str(e))
+        try:
+            pickle.dump(reply, replies)
+            replies.flush()
+        except BrokenPipeError:
+            break  # the serving process has gone away
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from flask import Flask
+from admission import AdmissionController, RouteClass, Rejected, api_controller
+
+def make_controller():
+    return AdmissionController(
+        route_classes=[
+            RouteClass('predict', priority=0, max_concurrent=1, max_queue=4,
+                       budget_seconds=1.0, service_seconds=0.01),
+            RouteClass('batch', priority=3, max_concurrent=1, max_queue=1,
+                       budget_seconds=60.0, service_seconds=5.0)
+        ],
+        routes={'/predict': 'predict', '/slow': 'batch'},
+        default_class='batch',
+        max_concurrent=1
+    )
+
+def test_priority_and_shedding():
+    controller = make_controller()
+    predict, batch = controller.classes['predict'], controller.classes['batch']
+    started = controller.acquire(batch)
+    batch.service_seconds = 0.5  # the running request is expected back within predict's budget
+
+    # Queued predict and batch requests: the freed slot goes to predict first
+    order = []
+    def wait(route_class):
+        admitted = controller.acquire(route_class)
+        order.append(route_class.name)
+        controller.release(route_class, admitted)
+    waiters = [threading.Thread(target=wait, args=(c,)) for c in (batch, predict)]
+    for thread in waiters:
+        thread.start()
+        time.sleep(0.05)
+
+    # The batch queue is full, so the next batch request is shed at once
+    try:
+        controller.acquire(batch)
+        assert False, 'expected the batch request to be shed'
+    except Rejected as e:
+        assert e.reason == 'queue_full' and e.retry_after > 0
+
+    controller.release(batch, started)
+    for thread in waiters:
+        thread.join()
+    assert order == ['predict', 'batch']
+    assert batch.shed['queue_full'] == 1 and controller.stats()['running'] == 0
+    print("✓ Predict is admitted first and full queues are shed")
+
+def test_overloaded_route_gets_fast_503():
+    app = Flask(__name__)
+    controller = make_controller()
+    controller.init_app(app)
+    release = threading.Event()
+
+    @app.route('/slow')
+    def slow():
+        release.wait(5)
+        return 'done'
+
+    @app.route('/predict', methods=['POST'])
+    def predict():
+        return 'scored'
+
+    client = app.test_client()
+    running = threading.Thread(target=client.get, args=('/slow',))
+    running.start()
+    time.sleep(0.05)
+
+    # The estimated wait behind a 5s batch request exceeds a 1s predict budget
+    start = time.perf_counter()
+    response = app.test_client().post('/predict')
+    assert response.status_code == 503
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['reason'] == 'over_budget'
+    assert time.perf_counter() - start < 0.5
+
+    release.set()
+    running.join()
+    assert controller.stats()['running'] == 0
+    print("✓ Requests over their latency budget get a fast 503 with Retry-After")
+
+def test_running_requests_count_toward_the_wait():
+    controller = make_controller()
+    predict, batch = controller.classes['predict'], controller.classes['batch']
+    started = controller.acquire(batch)  # holds the only slot for ~5s
+
+    # Nothing is queued, but the slot is not expected back within the budget
+    start = time.perf_counter()
+    try:
+        controller.acquire(predict)
+        assert False, 'expected the predict request to be shed'
+    except Rejected as e:
+        assert e.reason == 'over_budget' and e.retry_after > 4.0
+    assert time.perf_counter() - start < 0.05 and predict.queued == 0
+
+    controller.release(batch, started)
+    assert controller.in_flight == [] and controller._has_slot(predict)
+    print("✓ Requests still running count toward the estimated wait")
+
+def test_slow_classes_never_hold_every_predict_slot():
+    previous = os.environ.get('ADMISSION_MAX_CONCURRENT')
+    for max_concurrent in ('8', '4', '2'):
+        os.environ['ADMISSION_MAX_CONCURRENT'] = max_concurrent
+        try:
+            controller = api_controller()
+        finally:
+            if previous is None:
+                del os.environ['ADMISSION_MAX_CONCURRENT']
+            else:
+                os.environ['ADMISSION_MAX_CONCURRENT'] = previous
+        predict = controller.classes['predict']
+        others = [c for c in controller.classes.values() if c is not predict]
+
+        # Fill every other class up to as many slots as it is allowed
+        while any(controller._has_slot(c) for c in others):
+            controller._start(next(c for c in others if controller._has_slot(c)))
+        assert controller._has_slot(predict), max_concurrent
+
+        for _ in range(predict.reserved):
+            assert controller._has_slot(predict)
+            controller._start(predict)
+        assert controller.running <= controller.max_concurrent
+    print("✓ The shipped route classes always leave predict its reserved slots")
+
+if __name__ == "__main__":
+    test_priority_and_shedding()
+    test_overloaded_route_gets_fast_503()
+    test_running_requests_count_toward_the_wait()
+    test_slow_classes_never_hold_every_predict_slot()
+    print("\n🎉 All admission control tests passed!")
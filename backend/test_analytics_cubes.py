@@ -0,0 +1,40 @@
+import pandas as pd
+from analytics_cubes import AnalyticsCubes, DIMENSIONS
+
+def test_incremental_matches_full_build():
+    df = pd.read_csv('credit_card_fraud.csv')
+
+    full = AnalyticsCubes()
+    full.build(df)
+
+    incremental = AnalyticsCubes()
+    incremental.build(df.iloc[:5000])
+    incremental.update(df.iloc[5000:7000])
+    incremental.update(df.iloc[7000:])
+
+    assert incremental.summary() == full.summary()
+    for dimension in DIMENSIONS:
+        expected = {row['value']: row for row in full.breakdown(dimension)['rows']}
+        actual = {row['value']: row for row in incremental.breakdown(dimension)['rows']}
+        assert actual == expected, dimension
+    print("✓ Incremental cube updates match a full rebuild")
+
+def test_breakdown_cache_is_invalidated_on_update():
+    cubes = AnalyticsCubes()
+    cubes.build(pd.DataFrame({
+        'Card Type': ['Visa', 'Visa', 'MasterCard'],
+        'Fraud Flag or Label': [1, 0, 0]
+    }))
+    assert cubes.breakdown('card_type')['rows'][0] == {
+        'value': 'Visa', 'count': 2, 'fraud_count': 1, 'fraud_rate': 0.5
+    }
+
+    cubes.update(pd.DataFrame({'Card Type': ['MasterCard'] * 3, 'Fraud Flag or Label': [1, 1, 0]}))
+    top = cubes.breakdown('card_type')['rows'][0]
+    assert top['value'] == 'MasterCard' and top['count'] == 4 and top['fraud_count'] == 2
+    print("✓ Breakdown cache refreshed after update")
+
+if __name__ == "__main__":
+    test_incremental_matches_full_build()
+    test_breakdown_cache_is_invalidated_on_update()
+    print("\n🎉 All analytics cube tests passed!")
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from cross_validation import cross_validate, worker_count, MAX_N_JOBS
+from preprocessing import FEATURE_COLUMNS, DEFAULT_HASH_FEATURES
+
+def test_fold_scores_and_inputs():
+    df = pd.read_csv('credit_card_fraud.csv', nrows=1500)
+    report = cross_validate(df, n_splits=2, n_jobs=1)
+    assert report['total_samples'] == 1500 and report['n_jobs'] == 1
+
+    for name, scores in report['candidates'].items():
+        for metric in ('precision', 'recall', 'f1_score'):
+            folds = scores[metric]['folds']
+            assert len(folds) == 2, name
+            assert np.isclose(scores[metric]['mean'], np.mean(folds))
+            assert np.isclose(scores[metric]['variance'], np.var(folds))
+
+    # RandomForest folds see only the dense columns, the others the hashed ones too
+    n_dense = len(FEATURE_COLUMNS)
+    assert report['candidates']['RandomForest']['n_features'] == n_dense
+    for name in ('XGBoost', 'LogisticRegression'):
+        assert report['candidates'][name]['n_features'] == n_dense + DEFAULT_HASH_FEATURES
+    print("✓ Every candidate gets one score per fold, with mean and variance over the folds")
+
+def test_workers_stay_within_the_core_cap():
+    assert worker_count(-1) == worker_count(None) == MAX_N_JOBS
+    assert worker_count(10 ** 6) == MAX_N_JOBS and worker_count(1) == 1
+
+    df = pd.read_csv('credit_card_fraud.csv', nrows=600)
+    report = cross_validate(df, n_splits=2, n_jobs=-1, candidates=['XGBoost'])
+    assert report['n_jobs'] * report['threads_per_worker'] <= MAX_N_JOBS
+    print("✓ Fold workers times threads never exceed CV_MAX_JOBS cores")
+
+if __name__ == "__main__":
+    test_fold_scores_and_inputs()
+    test_workers_stay_within_the_core_cap()
+    print("\n🎉 All cross-validation tests passed!")
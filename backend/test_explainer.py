@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from model_trainer import FraudDetectionModel, build_candidates, fit_candidate
+from explainer import FraudExplainer
+from serving import FraudScorer
+
+def train_bundles():
+    """Each candidate model type fitted on a slice of the dataset, with its scaler and metadata"""
+    df = pd.read_csv('credit_card_fraud.csv', nrows=1500)
+    trainer = FraudDetectionModel()
+    trainer.fit_categories(df)
+    data = trainer.preprocess_data(df)
+    trainer.scaler.fit(data[trainer.feature_columns])
+    X = trainer._feature_matrix(df, data, trainer.scaler, 256)
+    y = data['Fraud Flag or Label'].to_numpy()
+
+    meta = {'categories': trainer.categories, 'feature_columns': trainer.feature_columns}
+    candidates = build_candidates()
+    candidates['RandomForest'].set_params(n_estimators=20)
+    for model in candidates.values():
+        fit_candidate(model, X, y, len(trainer.feature_columns))
+    batch = pd.read_csv('credit_card_fraud.csv', skiprows=range(1, 1501), nrows=50)
+    return candidates, trainer.scaler, meta, batch.drop(columns=['Fraud Flag or Label'])
+
+def model_output(model, X):
+    """What the attributions should add up to, in the explainer's units"""
+    if isinstance(model, xgb.XGBClassifier):
+        return model.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+    if hasattr(model, 'estimators_'):
+        return model.predict_proba(X)[:, 1]
+    return model.decision_function(X)
+
+def test_attributions_add_up_to_model_output():
+    candidates, scaler, meta, batch = train_bundles()
+    for name, model in candidates.items():
+        explainer = FraudExplainer(model, scaler, meta)
+        X = explainer.feature_matrix(batch)
+        assert explainer.n_hash == (0 if name == 'RandomForest' else 256)
+
+        # The explainer scores exactly the matrix the scorer predicts on
+        scorer = FraudScorer()
+        scorer.set_bundle(model, scaler, meta)
+        assert (abs(X - scorer._feature_matrix(batch, scorer.bundle)) > 0).sum() == 0
+
+        contribs, base_value = explainer.contributions(X)
+        fields = explainer.field_contributions(batch, contribs)
+        expected = model_output(model, X)
+        assert np.allclose(contribs.sum(axis=1) + base_value, expected, atol=1e-4), name
+        assert np.allclose(fields.sum(axis=1) + base_value, expected, atol=1e-4), name
+    print("✓ Attributions plus the base value add up to the model output for every model type")
+
+if __name__ == "__main__":
+    test_attributions_add_up_to_model_output()
+    print("\n🎉 All explainer tests passed!")
@@ -0,0 +1,46 @@
+import io
+import json
+import pandas as pd
+from preprocessing import hash_transactions, HASHED_COLUMNS, DEFAULT_HASH_FEATURES
+
+def same_columns(a, b):
+    return a.shape == b.shape and (a != b).nnz == 0
+
+def test_csv_and_json_rows_hash_identically():
+    df = pd.read_csv('credit_card_fraud.csv', nrows=50)
+    # What a client posts to /api/predict: the same rows as JSON objects
+    posted = json.loads(json.dumps(df.where(df.notna(), None).to_dict('records')))
+    assert same_columns(hash_transactions(df), hash_transactions(pd.DataFrame(posted)))
+
+    # A ZIP column with a gap is read from a CSV as floats; JSON sends integers
+    csv = io.StringIO('Merchant Name,Transaction Location (City or ZIP Code)\nAcme,110001\nAcme,\n')
+    from_csv = pd.read_csv(csv)
+    from_json = pd.DataFrame([{'Merchant Name': 'Acme', 'Transaction Location (City or ZIP Code)': 110001}])
+    assert from_csv.iloc[:, 1].dtype == float and from_json.iloc[:, 1].dtype == int
+    assert same_columns(hash_transactions(from_csv)[0], hash_transactions(from_json))
+    print("✓ CSV-loaded and JSON rows hash to the same columns")
+
+def test_missing_fields_hash_like_empty_ones():
+    empty = {col: '' for col in HASHED_COLUMNS}
+    expected = hash_transactions(pd.DataFrame([empty]))
+    assert same_columns(hash_transactions(pd.DataFrame([{col: None for col in HASHED_COLUMNS}])), expected)
+    assert same_columns(hash_transactions(pd.DataFrame([{'Transaction Amount': 10.0}])), expected)
+
+    # Missing in one row of a batch where other rows have the field
+    batch = pd.DataFrame([{'Merchant Name': 'Acme'}, {}])
+    assert same_columns(hash_transactions(batch)[1], expected)
+    print("✓ Missing fields hash like empty ones")
+
+def test_width_is_fixed():
+    df = pd.read_csv('credit_card_fraud.csv', nrows=200)
+    unseen = df.head(1).assign(**{col: 'never-seen-before' for col in HASHED_COLUMNS})
+    for batch in (df, df.head(1), unseen, df.head(0)):
+        assert hash_transactions(batch).shape == (len(batch), DEFAULT_HASH_FEATURES)
+    assert hash_transactions(df, 256).shape == (len(df), 256)
+    print("✓ Hashed width does not depend on the batch or its values")
+
+if __name__ == "__main__":
+    test_csv_and_json_rows_hash_identically()
+    test_missing_fields_hash_like_empty_ones()
+    test_width_is_fixed()
+    print("\n🎉 All hashing tests passed!")
@@ -0,0 +1,73 @@
+import copy
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from model_trainer import FraudDetectionModel
+
+_trained = {}
+
+def trained():
+    """One small training run shared by the tests: (trainer, new labeled rows)"""
+    if not _trained:
+        df = pd.read_csv('credit_card_fraud.csv')
+        trainer = FraudDetectionModel()
+        trainer.train_model(df.iloc[:3000])
+        _trained['trainer'], _trained['new_rows'] = trainer, df.iloc[3000:3600]
+    return copy.deepcopy(_trained['trainer']), _trained['new_rows']
+
+def test_each_model_type_continues_from_its_current_state():
+    trainer, new_rows = trained()
+    models = trainer.candidates
+
+    xgb_model = models['XGBoost']
+    rounds = xgb_model.get_booster().num_boosted_rounds()
+    candidate, _, _ = trainer.update_model(new_rows, xgb_model, trainer.scaler)
+    assert candidate.get_booster().num_boosted_rounds() == rounds + 10
+    assert xgb_model.get_booster().num_boosted_rounds() == rounds
+
+    forest = models['RandomForest']
+    candidate, candidate_scaler, _ = trainer.update_model(new_rows, forest, trainer.scaler)
+    assert len(candidate.estimators_) == 110 and len(forest.estimators_) == 100
+    assert candidate.n_features_in_ == forest.n_features_in_
+    assert candidate_scaler.n_samples_seen_ == trainer.scaler.n_samples_seen_
+
+    # Only the linear model moves the scaler statistics, on a copy of the scaler
+    linear, scaler = models['LogisticRegression'], trainer.scaler
+    seen = scaler.n_samples_seen_
+    candidate, candidate_scaler, _ = trainer.update_model(new_rows, linear, scaler)
+    assert isinstance(candidate, SGDClassifier) and candidate.coef_.shape == linear.coef_.shape
+    assert scaler.n_samples_seen_ == seen and candidate_scaler.n_samples_seen_ > seen
+    print("✓ XGBoost keeps boosting, RandomForest grows trees, LogisticRegression continues with SGD")
+
+def test_holdout_gate_decides_promotion():
+    trainer, new_rows = trained()
+    current = trainer.model
+    holdout_rows = len(trainer.holdout)
+
+    # No candidate can beat the current model by a whole F1 point
+    candidate, _, metrics = trainer.update_model(new_rows, current, trainer.scaler, tolerance=-1.0)
+    assert not metrics['promoted'] and trainer.model is current
+    assert metrics['holdout_samples'] == holdout_rows + int(len(new_rows) * 0.2)
+
+    _, _, metrics = trainer.update_model(new_rows, current, trainer.scaler, tolerance=1.0)
+    assert metrics['promoted'] and trainer.model is not current
+    print("✓ Candidates are promoted only when they pass the rolling hold-out")
+
+def test_single_class_rows_are_rejected():
+    trainer, new_rows = trained()
+    legit = new_rows[new_rows['Fraud Flag or Label'] == 0]
+    for rows, message in [
+        (legit, 'both fraud and non-fraud'),
+        (new_rows.drop(columns=['Fraud Flag or Label']), 'Fraud Flag or Label')
+    ]:
+        try:
+            trainer.update_model(rows, trainer.model, trainer.scaler)
+            assert False, 'expected the update to be rejected'
+        except ValueError as e:
+            assert message in str(e)
+    print("✓ New rows without both labels are rejected")
+
+if __name__ == "__main__":
+    test_each_model_type_continues_from_its_current_state()
+    test_holdout_gate_decides_promotion()
+    test_single_class_rows_are_rejected()
+    print("\n🎉 All incremental training tests passed!")
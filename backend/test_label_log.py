@@ -0,0 +1,64 @@
+import os
+import tempfile
+import threading
+from label_log import LabelLog
+from preprocessing import labeled_records, FEATURE_COLUMNS
+
+def test_concurrent_appends_keep_every_row():
+    log = LabelLog(os.path.join(tempfile.mkdtemp(), 'labels.jsonl'))
+    threads = [
+        threading.Thread(target=log.append, args=([{'id': f'{t}-{i}', 'label': i % 2} for i in range(50)],))
+        for t in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records, _ = log.read()
+    assert len(records) == 400 and log.pending_count() == 400
+    assert len({record['id'] for record in records}) == 400
+    print("✓ Concurrent appends do not lose batches")
+
+def test_rows_posted_during_training_stay_pending():
+    log = LabelLog(os.path.join(tempfile.mkdtemp(), 'labels.jsonl'))
+    log.append([{'id': 'a', 'label': 1}, {'id': 'b', 'label': 0}])
+
+    snapshot, end = log.read()
+    log.append([{'id': 'c', 'label': 1}])  # arrives while the model trains
+    log.consume(end)
+
+    pending, _ = log.read()
+    assert [record['id'] for record in snapshot] == ['a', 'b']
+    assert [record['id'] for record in pending] == ['c'] and log.pending_count() == 1
+    assert [record['id'] for record in log.read(start=0)[0]] == ['a', 'b', 'c']
+
+    # Consuming an older snapshot again never moves the offset back
+    log.consume(end)
+    assert log.pending_count() == 1
+    print("✓ Only the consumed snapshot is removed from the pending labels")
+
+def test_only_rows_with_a_binary_label_and_features_are_valid():
+    row = {col: 1 for col in FEATURE_COLUMNS}
+    records = [
+        {**row, 'Fraud Flag or Label': 1.0},
+        {**row, 'Fraud Flag or Label': 0},
+        {**row, 'Fraud Flag or Label': 'yes'},
+        {**row, 'Fraud Flag or Label': None},
+        {**row, 'Fraud Flag or Label': True},
+        {**row, 'Fraud Flag or Label': 2},
+        {'Card Type': 'Visa', 'Fraud Flag or Label': 1},
+        'not a transaction'
+    ]
+    valid, errors = labeled_records(records)
+    assert [record['Fraud Flag or Label'] for record in valid] == [1, 0]
+    assert isinstance(valid[0]['Fraud Flag or Label'], int)
+    assert sorted(errors) == [2, 3, 4, 5, 6, 7]
+    assert 'Transaction Amount' in errors[6]
+    print("✓ Labels must be 0 or 1 and rows must carry every model feature")
+
+if __name__ == "__main__":
+    test_concurrent_appends_keep_every_row()
+    test_rows_posted_during_training_stay_pending()
+    test_only_rows_with_a_binary_label_and_features_are_valid()
+    print("\n🎉 All label log tests passed!")
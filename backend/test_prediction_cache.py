@@ -0,0 +1,83 @@
+import time
+import numpy as np
+from prediction_cache import PredictionCache
+from serving import FraudScorer
+
+class RecordingScorer(FraudScorer):
+    """Flags amounts over 100 and records which transactions were scored"""
+
+    def __init__(self):
+        super().__init__(cache=PredictionCache(max_entries=10, ttl_seconds=60))
+        self.set_bundle(object(), object(), {'version': 1})
+        self.scored = []
+
+    def predict(self, transactions_df, bundle=None):
+        self.scored.append(transactions_df['Transaction ID'].tolist())
+        return np.array([int(amount > 100) for amount in transactions_df['Transaction Amount']])
+
+def test_lru_eviction_and_hits():
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    cache.put_many(['a', 'b'], [1, 0], model_version=1)
+    assert cache.get_many(['a'], model_version=1) == {0: 1}
+
+    # 'b' is now least recently used and gets evicted
+    cache.put_many(['c'], [1], model_version=1)
+    assert cache.get_many(['b', 'c', None], model_version=1) == {1: 1}
+
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1 and stats['evictions'] == 1
+    assert stats['entries'] == 2 and stats['memory_bytes'] > 0
+    print("✓ LRU eviction and hit counting work")
+
+def test_ttl_expiry_and_model_change():
+    cache = PredictionCache(max_entries=10, ttl_seconds=0.01)
+    cache.put_many(['a'], [1], model_version=1)
+    time.sleep(0.02)
+    assert cache.get_many(['a'], model_version=1) == {}
+    assert cache.stats()['expirations'] == 1
+
+    cache.ttl_seconds = 60
+    cache.put_many(['a'], [1], model_version=1)
+    assert cache.get_many(['a'], model_version=2) == {}
+    assert len(cache) == 0 and cache.stats()['invalidations'] == 1
+    print("✓ Expired entries and entries from an old model are not served")
+
+def test_scorer_scores_only_cache_misses():
+    scorer = RecordingScorer()
+    scorer.predict_transactions([
+        {'Transaction ID': 'a', 'Transaction Amount': 500},
+        {'Transaction ID': 'b', 'Transaction Amount': 5}
+    ])
+
+    predictions = scorer.predict_transactions([
+        {'Transaction ID': 'c', 'Transaction Amount': 900},
+        {'Transaction ID': 'b', 'Transaction Amount': 5},
+        {'Transaction ID': ['not', 'hashable'], 'Transaction Amount': 1},
+        {'Transaction ID': 'a', 'Transaction Amount': 500},
+        {'Transaction ID': {'id': 'x'}, 'Transaction Amount': 200}
+    ])
+    assert predictions.tolist() == [1, 0, 0, 1, 1]
+    assert scorer.scored[1] == ['c', ['not', 'hashable'], {'id': 'x'}]
+    assert len(scorer.cache) == 3
+    print("✓ Only cache misses are scored, in the original order, and non-scalar IDs are not cached")
+
+def test_bool_and_nan_ids_are_not_cached():
+    scorer = RecordingScorer()
+    scorer.predict_transactions([{'Transaction ID': 1, 'Transaction Amount': 500}])
+
+    # True == 1, but a transaction with ID true is a different transaction
+    predictions = scorer.predict_transactions([
+        {'Transaction ID': True, 'Transaction Amount': 5},
+        {'Transaction ID': float('nan'), 'Transaction Amount': 5},
+        {'Transaction ID': float('inf'), 'Transaction Amount': 5}
+    ])
+    assert predictions.tolist() == [0, 0, 0]
+    assert len(scorer.cache) == 1
+    print("✓ Boolean and non-finite IDs are scored but never cached")
+
+if __name__ == "__main__":
+    test_lru_eviction_and_hits()
+    test_ttl_expiry_and_model_change()
+    test_scorer_scores_only_cache_misses()
+    test_bool_and_nan_ids_are_not_cached()
+    print("\n🎉 All prediction cache tests passed!")
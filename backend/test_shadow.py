@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+from shadow import ShadowScorer, BUNDLE_FILES
+from serving import FraudScorer
+
+def make_challengers():
+    challengers_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(challengers_dir, 'Copy'))
+    sources = ['models/fraud_detection_model.pkl', 'models/scaler.pkl', None]
+    for source, filename in zip(sources, BUNDLE_FILES):
+        target = os.path.join(challengers_dir, 'Copy', filename)
+        if source:
+            shutil.copy(source, target)
+        else:
+            with open(target, 'w') as f:
+                f.write('{}')
+    return challengers_dir
+
+def test_worker_starts_on_first_batch_in_the_serving_process():
+    shadow = ShadowScorer(champion=None, challengers_dir=make_challengers())
+    assert shadow.load() == ['Copy'] and shadow.worker is None
+
+    shadow.submit([{'Transaction Amount': 10.0}], [0])
+    first = shadow.worker
+    assert first is not None and shadow.worker_pid == os.getpid()
+
+    # A forked process inherits the parent's worker; it must start its own
+    shadow.worker_pid = -1
+    shadow.submit([{'Transaction Amount': 10.0}], [0])
+    assert shadow.worker is not first and shadow.worker_pid == os.getpid()
+    assert first.poll() is None  # the parent's worker is left alone
+
+    shadow.stop()
+    first.terminate()
+    first.wait()
+    print("✓ The shadow worker starts lazily in the process that serves")
+
+def wait_for(condition, timeout=30):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+def test_champion_distribution_is_scored_with_the_challengers():
+    champion = FraudScorer()
+    champion.ensure_loaded()
+    shadow = ShadowScorer(champion=champion, challengers_dir=make_challengers())
+    shadow.load()
+
+    rows = pd.read_csv('credit_card_fraud.csv', nrows=4).drop(columns=['Fraud Flag or Label'])
+    batch = json.loads(rows.to_json(orient='records'))
+    shadow.submit(batch, [0, 0, 0, 0])
+    assert wait_for(lambda: shadow.stats()['champion']['transactions'] == 4)
+
+    # The challenger is a copy of the champion, so their distributions match
+    stats = shadow.stats()
+    assert stats['champion']['score_histogram'] == stats['models']['Copy']['score_histogram']
+    assert stats['champion']['flag_rate'] == stats['models']['Copy']['flag_rate']
+    assert sum(stats['champion']['score_histogram']) == 4
+
+    # A champion swapped in place restarts the worker and its distribution
+    first = shadow.worker
+    champion.set_bundle(*champion.bundle[:2], {**champion.bundle[2], 'version': champion.version + 1})
+    shadow.submit(batch[:1], [0])
+    assert shadow.worker is not first
+    assert wait_for(lambda: shadow.stats()['champion']['transactions'] == 1)
+
+    shadow.stop()
+    first.wait()
+    print("✓ The champion's score distribution is recorded next to the challengers'")
+
+if __name__ == "__main__":
+    test_worker_starts_on_first_batch_in_the_serving_process()
+    test_champion_distribution_is_scored_with_the_challengers()
+    print("\n🎉 All shadow scoring tests passed!")
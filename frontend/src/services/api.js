@@ -63,6 +63,7 @@ export const fraudDetectionAPI = {
   // Model training
   trainModel: (data) => api.post('/train', { data }),
   trainFromCSV: () => api.post('/train-from-csv'),
+  retrainIncremental: (transactions) => api.post('/retrain-incremental', { transactions }),
 
   // Fraud prediction
   predictFraud: (transactions) => api.post('/predict', { transactions }),
@@ -76,6 +77,11 @@ export const fraudDetectionAPI = {
 
   // Get dataset info
   getDatasetInfo: () => api.get('/dataset-info'),
+
+  // Precomputed analytics breakdowns
+  getAnalyticsBreakdown: (dimension, limit) =>
+    api.get('/analytics/breakdown', { params: { dimension, limit } }),
+  addLabeledTransactions: (transactions) => api.post('/analytics/transactions', { transactions }),
 };
 
 export default api; 
\ No newline at end of file